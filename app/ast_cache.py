@@ -0,0 +1,72 @@
+# ast_cache.py
+
+import ast
+import functools
+import os
+import pickle
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional, Union
+from .config import cache_dir
+from .parse_cache import content_digest
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Trees pickled by one Python version may not load, or not mean the same, in another
+_PYTHON_TAG = f"py{sys.version_info[0]}{sys.version_info[1]}"
+
+# Pickled trees compress 3-4x; entries are named by codec so installing or
+# removing zstandard never has one codec read the other's files
+if zstandard is not None:
+    _SUFFIX = ".pickle.zst"
+    _compress = zstandard.ZstdCompressor(level=3).compress
+    _decompress = zstandard.ZstdDecompressor().decompress
+else:
+    _SUFFIX = ".pickle.z"
+    _compress = functools.partial(zlib.compress, level=3)
+    _decompress = zlib.decompress
+
+def _entry_path(digest: bytes, kind: str) -> Optional[Path]:
+    """Disk cache entry for a tree parsed from content with this digest"""
+    try:
+        return cache_dir("ast") / f"{digest.hex()}-{kind}-{_PYTHON_TAG}{_SUFFIX}"
+    except OSError:
+        return None
+
+def parse_cached(content: Union[bytes, str], filename: str = "<unknown>", digest: Optional[bytes] = None) -> ast.Module:
+    """Parse Python source, reusing the tree pickled by an earlier run for the same content.
+    Bytes and already-decoded text are cached apart, as a coding cookie only applies to bytes."""
+    is_text = isinstance(content, str)
+    if digest is None:
+        digest = content_digest(content.encode() if is_text else content)
+    path = _entry_path(digest, "text" if is_text else "bytes")
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                return pickle.loads(_decompress(f.read()))
+        except Exception:
+            pass  # Missing or corrupt entry: parse and overwrite it
+
+    tree = ast.parse(content, filename=filename)
+
+    if path is not None:
+        try:
+            data = _compress(pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL))
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, RecursionError):
+            pass
+    return tree
+
+def load_or_parse(path: str) -> ast.Module:
+    """Parse a Python file through the disk cache"""
+    with open(path, "rb") as f:
+        content = f.read()
+    return parse_cached(content, filename=path)
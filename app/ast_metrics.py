@@ -0,0 +1,223 @@
+# ast_metrics.py
+
+import ast
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+from .source_cache import load_tree
+
+@dataclass
+class UnifiedAstMetrics:
+    """Everything the complexity, database, documentation and metrics analyzers read from one module's tree"""
+    # Complexity: function name -> start/end line, parameters, nesting, branches
+    functions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Documentation: functions keyed by name (methods as Class.method) and classes by name
+    module_docstring: Optional[str] = None
+    doc_functions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    doc_classes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Metrics: definition counts, nested meaning defined inside another function/class
+    function_count: int = 0
+    class_count: int = 0
+    nested_count: int = 0
+    # Database: imported module names in source order, and every call as
+    # (node, enclosing function, number of imports seen before it)
+    imports: List[str] = field(default_factory=list)
+    calls: List[Tuple[ast.Call, str, int]] = field(default_factory=list)
+
+# Tree -> its metrics, so analyzers handed the same parsed tree walk it once;
+# entries go away with the tree (parse_cache bounds how many stay alive)
+_walked: "weakref.WeakKeyDictionary[ast.Module, UnifiedAstMetrics]" = weakref.WeakKeyDictionary()
+
+def _metrics_for(tree: ast.Module) -> UnifiedAstMetrics:
+    metrics = _walked.get(tree)
+    if metrics is None:
+        visitor = UnifiedVisitor()
+        visitor.visit(tree)
+        metrics = _walked[tree] = visitor.metrics
+    return metrics
+
+def collect_metrics(file_path: str, ast_cache: Optional[Dict[str, ast.Module]] = None,
+                    ast_metrics: Optional[Dict[str, UnifiedAstMetrics]] = None) -> UnifiedAstMetrics:
+    """Return the module's metrics, from ast_metrics when it has them, otherwise by walking its tree"""
+    if ast_metrics is not None and file_path in ast_metrics:
+        return ast_metrics[file_path]
+    return _metrics_for(load_tree(file_path, ast_cache))
+
+def walk_trees(ast_cache: Dict[str, ast.Module]) -> Dict[str, UnifiedAstMetrics]:
+    """Walk every cached tree once, keyed like ast_cache"""
+    return {file_path: _metrics_for(tree) for file_path, tree in ast_cache.items()}
+
+def _has_docstring(node) -> bool:
+    return (
+        node.body and isinstance(node.body[0], ast.Expr) and
+        isinstance(node.body[0].value, ast.Constant) and
+        isinstance(node.body[0].value.value, str)
+    )
+
+# Statements that open a nested block inside a function (ast.TryStar from 3.11)
+_NESTING_TYPES = tuple(
+    getattr(ast, name) for name in ("If", "For", "AsyncFor", "While", "Try", "TryStar", "With", "AsyncWith")
+    if hasattr(ast, name)
+)
+
+# Per AST node class, the fields that can hold child nodes. Learned from the
+# first instance seen: identifier/int/constant fields never hold nodes. A field
+# that was None there may still be an optional identifier, so values are
+# still type-checked when visited.
+_CHILD_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+def _child_fields(node: ast.AST) -> Tuple[str, ...]:
+    cls = type(node)
+    fields = _CHILD_FIELDS.get(cls)
+    if fields is None:
+        fields = []
+        for name in cls._fields:
+            value = getattr(node, name, None)
+            if value is None or isinstance(value, (ast.AST, list)):
+                fields.append(name)
+        fields = _CHILD_FIELDS[cls] = tuple(fields)
+    return fields
+
+class UnifiedVisitor(ast.NodeVisitor):
+    """Single AST pass collecting the complexity, database, documentation and metrics signals"""
+    
+    # Node class -> visit_* function, filled in below the class body
+    _DISPATCH: Dict[type, Any] = {}
+    
+    def __init__(self):
+        self.metrics = UnifiedAstMetrics()
+        self.current_function = None
+        self.current_class = None
+        self.nesting_depth = 0
+        self.max_nesting = 0
+        self.current_branches = 0
+        self.depth = 0
+    
+    def visit(self, node):
+        self._DISPATCH.get(type(node), UnifiedVisitor.generic_visit)(self, node)
+    
+    def generic_visit(self, node):
+        visit = self.visit
+        for name in _child_fields(node):
+            value = getattr(node, name, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+    
+    def visit_Module(self, node):
+        if _has_docstring(node):
+            self.metrics.module_docstring = node.body[0].value.value
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        metrics = self.metrics
+        name = node.name
+        args = node.args.args
+        start_line = node.lineno
+        end_line = node.end_lineno or start_line
+        
+        # Complexity: nesting and branches are filled in after the body is visited
+        entry = {
+            'start_line': start_line,
+            'end_line': end_line,
+            'parameters': tuple(arg.arg for arg in args),
+            'max_nesting': 0,
+            'branches': 0
+        }
+        metrics.functions[name] = entry
+        
+        # Documentation: methods are keyed Class.method
+        has_return_annotation = node.returns is not None
+        has_param_annotations = any(arg.annotation is not None for arg in args)
+        doc_name = f"{self.current_class}.{name}" if self.current_class else name
+        metrics.doc_functions[doc_name] = {
+            "has_docstring": _has_docstring(node),
+            "has_type_hints": has_return_annotation or has_param_annotations,
+            "has_return_annotation": has_return_annotation,
+            "has_param_annotations": has_param_annotations,
+            "parameter_count": len(args),
+            "line_count": end_line - start_line + 1
+        }
+        
+        metrics.function_count += 1
+        if self.depth > 0:
+            metrics.nested_count += 1
+        
+        old_function = self.current_function
+        old_nesting = self.nesting_depth
+        old_max_nesting = self.max_nesting
+        old_branches = self.current_branches
+        
+        self.current_function = name
+        self.nesting_depth = 0
+        self.max_nesting = 0
+        self.current_branches = 0
+        self.depth += 1
+        
+        self.generic_visit(node)
+        
+        self.depth -= 1
+        entry['max_nesting'] = self.max_nesting
+        entry['branches'] = self.current_branches
+        
+        self.current_function = old_function
+        self.nesting_depth = old_nesting
+        self.max_nesting = old_max_nesting
+        self.current_branches = old_branches
+    
+    def visit_AsyncFunctionDef(self, node):
+        self.visit_FunctionDef(node)  # Same logic as regular function
+    
+    def visit_ClassDef(self, node):
+        metrics = self.metrics
+        metrics.doc_classes[node.name] = {
+            "has_docstring": _has_docstring(node),
+            "method_count": len([n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]),
+            "line_count": (node.end_lineno or node.lineno) - node.lineno + 1
+        }
+        metrics.class_count += 1
+        if self.depth > 0:
+            metrics.nested_count += 1
+        
+        old_class = self.current_class
+        self.current_class = node.name
+        self.depth += 1
+        self.generic_visit(node)
+        self.depth -= 1
+        self.current_class = old_class
+    
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.metrics.imports.append(alias.name)
+    
+    def visit_ImportFrom(self, node):
+        if node.module:
+            self.metrics.imports.append(node.module)
+    
+    def visit_Call(self, node):
+        metrics = self.metrics
+        metrics.calls.append((node, self.current_function or "module_level", len(metrics.imports)))
+        self.generic_visit(node)
+    
+    def _visit_block(self, node):
+        """Shared handler for the compound statements in _NESTING_TYPES"""
+        if self.current_function:
+            if type(node) is ast.If:
+                self.current_branches += 1
+            self.nesting_depth += 1
+            if self.nesting_depth > self.max_nesting:
+                self.max_nesting = self.nesting_depth
+            self.generic_visit(node)
+            self.nesting_depth -= 1
+        else:
+            self.generic_visit(node)
+
+UnifiedVisitor._DISPATCH = {
+    getattr(ast, name[len('visit_'):]): func
+    for name, func in vars(UnifiedVisitor).items()
+    if name.startswith('visit_') and hasattr(ast, name[len('visit_'):])
+}
+UnifiedVisitor._DISPATCH.update(dict.fromkeys(_NESTING_TYPES, UnifiedVisitor._visit_block))
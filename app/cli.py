@@ -1,86 +1,278 @@
 # cli.py
 
 import argparse
+import dataclasses
+import hashlib
+import logging
+import os
+import pickle
+import queue
 import sys
-import toml
-import json
+import tempfile
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing import shared_memory
 from pathlib import Path
 from typing import Dict, Any
 
 from .scanner import ModuleScanner
 from .linker import DependencyLinker
-from .exporter import export_json, export_csv, export_dot, export_function_map_json, export_function_dot
-from .config import Walk3rConfig
-from .db_compliance import DatabaseComplianceAnalyzer
+from .exporter import export_json, export_csv, export_dot, export_function_map_json, export_function_dot, write_json, bundle_reports
+from .config import Walk3rConfig, available_cpus, cache_dir
 
-# Import new analysis modules (with graceful fallback)
-try:
+logger = logging.getLogger("walk3r")
+
+# Analysis modules are imported lazily by the steps that use them, so basic
+# mode never pays for them; an import failure is reported by that step alone
+LONG_WALK_AVAILABLE = True
+
+DEFAULT_CONFIG = "walk3r.toml"
+
+# Export dispatch by format, for the dependency map and the function map
+_EXPORTERS = {"json": export_json, "csv": export_csv, "dot": export_dot}
+_FUNC_EXPORTERS = {"json": export_function_map_json, "dot": export_function_dot}
+
+# Bump when the scanner's output format changes so stale cache entries are ignored
+SCAN_CACHE_VERSION = 2
+
+def _count_functions(raw_data: Dict[str, Dict]) -> int:
+    """Total number of functions across all scanned modules"""
+    total = 0
+    for data in raw_data.values():
+        functions = data.get('functions')
+        total += len(functions) if functions else 0
+    return total
+
+def _cached_scan(root_path: str) -> Dict[str, Dict]:
+    """Scan root_path, reusing the pickled result of a previous run if no file changed"""
+    scanner = ModuleScanner(root_path)
+    
+    # Fingerprint every file's path, mtime and size so edits invalidate the entry
+    fingerprint = hashlib.sha256()
+    for filepath in scanner.iter_files():
+        st = os.stat(filepath)
+        fingerprint.update(f"{filepath}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    fingerprint = fingerprint.digest()
+    
+    # One entry per project root, overwritten in place when the fingerprint changes
+    root_key = hashlib.sha256(f"walk3r-scan-v{SCAN_CACHE_VERSION}\n{os.path.abspath(root_path)}".encode())
+    try:
+        cache_path = cache_dir("scans") / f"{root_key.hexdigest()}.pkl"
+    except OSError:
+        cache_path = None
+    
+    if cache_path is not None:
+        try:
+            with open(cache_path, "rb") as f:
+                cached_fingerprint, raw_data = pickle.load(f)
+            if cached_fingerprint == fingerprint:
+                return raw_data
+        except Exception:
+            pass  # Missing or corrupt entry: rescan and overwrite it
+    
+    raw_data = scanner.scan()
+    
+    if cache_path is not None:
+        try:
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump((fingerprint, raw_data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
+    return raw_data
+
+def _run_metrics(root_path, raw_data, config):
     from .metrics import MetricsAnalyzer
+    return MetricsAnalyzer(root_path, raw_data).analyze_metrics()
+
+def _run_complexity(root_path, raw_data, config):
     from .complexity import ComplexityAnalyzer
+    return ComplexityAnalyzer(root_path, raw_data, config).analyze_complexity()
+
+def _run_db_detection(root_path, raw_data, config):
     from .db_detector import DatabaseCallDetector
+    return DatabaseCallDetector(root_path, raw_data, config).detect_db_calls()
+
+def _run_doc_coverage(root_path, raw_data, config):
     from .doc_coverage import DocCoverageAnalyzer
-    from .summary import ProjectSummarizer
-    LONG_WALK_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️  Warning: Long walk modules not available: {e}")
-    print("   Only basic analysis mode will work.")
-    LONG_WALK_AVAILABLE = False
+    return DocCoverageAnalyzer(root_path, raw_data).analyze_documentation()
+
+def _run_db_compliance(root_path, raw_data, config):
+    from .db_compliance import DatabaseComplianceAnalyzer
+    return DatabaseComplianceAnalyzer(root_path, raw_data, config).analyze_compliance()
+
+# Set in each worker process by _init_worker
+_worker_raw_data = None
+
+def _share_raw_data(raw_data: Dict[str, Dict]):
+    """Pickle raw_data once into a shared memory block, returning (block, size) or (None, 0)"""
+    payload = pickle.dumps(raw_data, protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=max(len(payload), 1))
+    except OSError:
+        return None, 0
+    shm.buf[:len(payload)] = payload
+    return shm, len(payload)
+
+def _init_worker_logging():
+    """Pool initializer: log straight to stdout, since the parent's queue listener does not run here"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+
+def _init_worker(shm_name: str, size: int):
+    """Pool initializer: load raw_data from shared memory once per worker"""
+    global _worker_raw_data
+    _init_worker_logging()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        with shm.buf[:size] as view:
+            _worker_raw_data = pickle.loads(view)
+    finally:
+        shm.close()
+
+def _step_config(config: Walk3rConfig, workers: int) -> Walk3rConfig:
+    """Config for the step workers, each given an equal share of the --jobs budget.
+    A step worker that fans out waits on its own pool, so a share counts the worker
+    itself plus its pool; below three slots a pool cannot help and jobs is 1."""
+    share = config.jobs // workers
+    return dataclasses.replace(config, jobs=share - 1 if share >= 3 else 1)
+
+def _run_timed(runner, root_path, raw_data, config):
+    """Run a step in its worker, returning (result, seconds the step took there)"""
+    start = time.perf_counter()
+    result = runner(root_path, raw_data, config)
+    return result, time.perf_counter() - start
+
+def _run_shared(runner, root_path, config):
+    return _run_timed(runner, root_path, _worker_raw_data, config)
+
+# Steps 2-6 only read raw_data, so each runs in its own worker process.
+# Runners are top-level functions so they can be pickled.
+ANALYSIS_STEPS = (
+    ("metrics", "enable_metrics", _run_metrics),
+    ("complexity", "enable_complexity", _run_complexity),
+    ("db_calls", "enable_db_detection", _run_db_detection),
+    ("documentation", "enable_doc_coverage", _run_doc_coverage),
+    ("db_compliance", "enable_db_compliance", _run_db_compliance),
+)
+
+@contextmanager
+def _step(name: str, timings: Dict[str, float]):
+    """Time the enclosed step, recording it in timings and printing it"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[name] = round(elapsed, 3)
+        logger.info(f"   ⏱️  {name}: {elapsed:.2f}s")
+
+def _step_result(name: str, future, timings: Dict[str, float]):
+    """Wait for a step worker's result. Steps run side by side, so the time a step
+    took is measured in its worker; the wait here is recorded apart as name_wait."""
+    start = time.perf_counter()
+    result, elapsed = future.result()
+    waited = time.perf_counter() - start
+    timings[name] = round(elapsed, 3)
+    timings[f"{name}_wait"] = round(waited, 3)
+    logger.info(f"   ⏱️  {name}: {elapsed:.2f}s (waited {waited:.2f}s)")
+    return result
+
+@contextmanager
+def _guarded(message: str):
+    """Report a failure in the enclosed step as a warning instead of aborting the run"""
+    try:
+        yield
+    except Exception as e:
+        logger.info(f"   ⚠️  Warning: {message}: {e}")
+
+def _start_logging() -> QueueListener:
+    """Send walk3r log records through a queue; a background thread writes them to stdout"""
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, handler)
+    logger.handlers[:] = [QueueHandler(log_queue)]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
 
 def main():
     parser = argparse.ArgumentParser(description="Walk3r - Python Dependency Mapper")
     parser.add_argument("--path", required=True, help="Path to source directory")
     parser.add_argument("--format", choices=["json", "csv", "dot"], default="json", help="Export format")
-    parser.add_argument("--output", default=f"dependency_graph-{datetime.now().strftime('%Y%m%d')}", help="Output file name without extension")
+    parser.add_argument("--output", default=None, help="Output file name without extension (default: dependency_graph-YYYYMMDD)")
     parser.add_argument("--mode", choices=["basic", "long"], default="basic", help="Analysis mode: basic (original) or long (comprehensive)")
-    parser.add_argument("--config", default="walk3r.toml", help="Configuration file path")
+    parser.add_argument("--config", default=None, help=f"Configuration file path (default: {DEFAULT_CONFIG})")
+    parser.add_argument("--jobs", type=int, default=None, help="Long mode: maximum parallel workers (default: available CPUs)")
+    parser.add_argument("--bundle", choices=["none", "tar", "sqlite"], default="none", help="Long mode: pack all reports into a single .tar.gz or .sqlite file")
     args = parser.parse_args()
+    
+    listener = _start_logging()
+    
+    # One date tag per run, so every output file agrees even across midnight
+    date_tag = datetime.now().strftime("%Y%m%d")
 
     try:
         if args.mode == "basic":
-            return run_basic_analysis(args)
+            return run_basic_analysis(args, date_tag)
         elif args.mode == "long":
             if not LONG_WALK_AVAILABLE:
-                print("❌ Long walk mode requires additional analysis modules that are not available.")
-                print("   Please ensure all analysis modules are properly installed.")
+                logger.info("❌ Long walk mode requires additional analysis modules that are not available.")
+                logger.info("   Please ensure all analysis modules are properly installed.")
                 return 1
-            return run_long_walk_analysis(args)
+            return run_long_walk_analysis(args, date_tag)
     except Exception as e:
-        print(f"❌ Analysis failed: {e}")
+        logger.info(f"❌ Analysis failed: {e}")
         return 1
+    finally:
+        # Stopping the listener flushes any queued output
+        listener.stop()
 
-def run_basic_analysis(args):
+def run_basic_analysis(args, date_tag: str):
     """Run the original basic analysis (preserves exact original functionality)"""
-    print("🚶 Running basic dependency analysis...")
+    logger.info("🚶 Running basic dependency analysis...")
     
-    scanner = ModuleScanner(args.path)
-    raw_data = scanner.scan()
+    raw_data = _cached_scan(args.path)
 
     linker = DependencyLinker(raw_data)
     mapped = linker.resolve_links()
 
-    output_path = f"{args.output}.{args.format}"
-    if args.format == "json":
-        export_json(mapped, output_path)
-    elif args.format == "csv":
-        export_csv(mapped, output_path)
-    elif args.format == "dot":
-        export_dot(mapped, output_path)
+    output_base = args.output or f"dependency_graph-{date_tag}"
+    output_path = f"{output_base}.{args.format}"
+    _EXPORTERS[args.format](mapped, output_path)
 
-    print(f"✅ Dependency graph written to {output_path}")
+    logger.info(f"✅ Dependency graph written to {output_path}")
     return 0
 
-def run_long_walk_analysis(args):
+def run_long_walk_analysis(args, date_tag: str):
     """Run comprehensive long walk analysis"""
-    print("🚶‍♀️ Running comprehensive long walk analysis...")
+    logger.info("🚶‍♀️ Running comprehensive long walk analysis...")
     
-    # Load configuration
-    try:
-        with open(args.config, 'r') as f:
-            config_data = toml.load(f)['walk3r']
-        config = Walk3rConfig(**config_data)
-    except Exception as e:
-        print(f"⚠️  Warning: Could not load config from {args.config}, using defaults: {e}")
+    # Load configuration; without a config file, go straight to the defaults
+    config = None
+    config_path = Path(args.config or DEFAULT_CONFIG)
+    if config_path.is_file():
+        try:
+            try:
+                import tomllib
+            except ImportError:  # Python < 3.11
+                import tomli as tomllib
+            with open(config_path, 'rb') as f:
+                config_data = tomllib.load(f)['walk3r']
+            config = Walk3rConfig(**config_data)
+        except Exception as e:
+            logger.info(f"⚠️  Warning: Could not load config from {config_path}, using defaults: {e}")
+    elif args.config is not None:
+        logger.info(f"⚠️  Warning: Config file {config_path} not found, using defaults")
+    if config is None:
         config = Walk3rConfig(
             root_path=args.path,
             output_dir="./reports/",
@@ -89,202 +281,228 @@ def run_long_walk_analysis(args):
     
     # Use config values, with command line overrides
     root_path = getattr(config, 'root_path', args.path)
+    config = dataclasses.replace(config, jobs=max(1, getattr(args, 'jobs', None) or config.jobs or available_cpus()))
+    # Keep any native thread pools in downstream libraries within the same budget
+    os.environ.setdefault("OMP_NUM_THREADS", str(config.jobs))
     output_dir = Path(config.output_dir)
     
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Get timestamp for all files
-    date_tag = datetime.now().strftime("%Y%m%d")
-    
-    print(f"📁 Output directory: {output_dir}")
-    print(f"🎯 Analyzing: {root_path}")
-    
-    # Step 1: Basic dependency analysis (same as original)
-    print("\n📊 Step 1: Scanning modules and dependencies...")
+    # When bundling, reports are staged locally and packed into one file at the end
+    bundle = getattr(args, 'bundle', 'none')
+    staging = tempfile.TemporaryDirectory(prefix="walk3r-") if bundle != "none" else None
+    # Every exit below, early returns and exceptions included, removes the staging directory
     try:
-        scanner = ModuleScanner(root_path)
-        raw_data = scanner.scan()
+        report_dir = Path(staging.name) if staging is not None else output_dir
+        # Report paths are built from a plain string prefix rather than repeated Path joins
+        report_base = str(report_dir) + os.sep
         
-        linker = DependencyLinker(raw_data)
-        dependency_map = linker.resolve_links()
-        function_map = linker.get_function_map()
+        logger.info(f"📁 Output directory: {output_dir}")
+        logger.info(f"🎯 Analyzing: {root_path}")
         
-        print(f"   Found {len(raw_data)} modules with {sum(len(data.get('functions', {})) for data in raw_data.values())} functions")
-    except Exception as e:
-        print(f"   ❌ Module scanning failed: {e}")
-        return 1
-    
-    # Export basic dependency files
-    for fmt in config.formats:
+        # Step 1: Basic dependency analysis (same as original)
+        logger.info("\n📊 Step 1: Scanning modules and dependencies...")
+        timings = {}
         try:
-            output_path = output_dir / f"deps-{date_tag}.{fmt}"
-            if fmt == "json":
-                export_json(dependency_map, output_path)
-            elif fmt == "csv":
-                export_csv(dependency_map, output_path)
-            elif fmt == "dot":
-                export_dot(dependency_map, output_path)
-            print(f"   ✅ Basic {fmt.upper()} exported: {output_path.name}")
+            with _step("scan", timings):
+                raw_data = _cached_scan(root_path)
+                
+                linker = DependencyLinker(raw_data)
+                dependency_map = linker.resolve_links()
+                function_map = linker.get_function_map()
+                
+                logger.info(f"   Found {len(raw_data)} modules with {_count_functions(raw_data)} functions")
         except Exception as e:
-            print(f"   ⚠️  Warning: Could not export {fmt}: {e}")
-    
-    # Export function maps
-    try:
-        func_json_path = output_dir / f"functions-{date_tag}.json"
-        export_function_map_json(function_map, func_json_path)
-        print(f"   ✅ Function map exported: {func_json_path.name}")
+            logger.info(f"   ❌ Module scanning failed: {e}")
+            return 1
         
-        func_dot_path = output_dir / f"functions-{date_tag}.dot"
-        export_function_dot(function_map, func_dot_path)
-        print(f"   ✅ Function graph exported: {func_dot_path.name}")
-    except Exception as e:
-        print(f"   ⚠️  Warning: Could not export function maps: {e}")
-    
-    # Collect all analysis data
-    all_analysis_data = {
-        'dependencies': dependency_map,
-        'functions': function_map
-    }
-    
-    # Step 2: Metrics Analysis
-    if config.enable_metrics:
-        print("\n📏 Step 2: Analyzing code metrics...")
-        try:
-            metrics_analyzer = MetricsAnalyzer(root_path, raw_data)
-            metrics_data = metrics_analyzer.analyze_metrics()
-            all_analysis_data['metrics'] = metrics_data
-            
-            metrics_path = output_dir / f"metrics-{date_tag}.json"
-            with open(metrics_path, 'w', encoding='utf-8') as f:
-                json.dump({"metrics": metrics_data}, f, indent=2)
-            print(f"   ✅ Metrics analysis exported: {metrics_path.name}")
+        # Export basic dependency files
+        # Each export is an independent serialize-and-write, so overlap them on threads
+        export_jobs = {}
+        with ThreadPoolExecutor(max_workers=min(config.jobs, len(config.formats) + 2)) as export_pool:
+            for fmt in config.formats:
+                if fmt not in _EXPORTERS:
+                    logger.info(f"   ⚠️  Warning: Could not export {fmt}: unsupported format")
+                    continue
+                output_path = f"{report_base}deps-{date_tag}.{fmt}"
+                job = export_pool.submit(_EXPORTERS[fmt], dependency_map, output_path)
+                export_jobs[job] = (f"Basic {fmt.upper()} exported", fmt, output_path)
             
-            # Print brief summary
-            summary = metrics_data.get('project_summary', {})
-            print(f"   📈 Project: {summary.get('total_files', 0)} files, {summary.get('total_lines_of_code', 0)} lines, {summary.get('total_functions', 0)} functions")
-        except Exception as e:
-            print(f"   ⚠️  Warning: Metrics analysis failed: {e}")
-    
-    # Step 3: Complexity Analysis
-    if config.enable_complexity:
-        print("\n🧠 Step 3: Analyzing function complexity...")
-        try:
-            complexity_analyzer = ComplexityAnalyzer(root_path, raw_data, config)
-            complexity_data = complexity_analyzer.analyze_complexity()
-            all_analysis_data['complexity'] = complexity_data
+            # Export function maps
+            func_json_path = f"{report_base}functions-{date_tag}.json"
+            job = export_pool.submit(_FUNC_EXPORTERS["json"], function_map, func_json_path)
+            export_jobs[job] = ("Function map exported", "function map", func_json_path)
             
-            complexity_path = output_dir / f"complexity-{date_tag}.json"
-            with open(complexity_path, 'w', encoding='utf-8') as f:
-                json.dump({"complexity": complexity_data}, f, indent=2)
-            print(f"   ✅ Complexity analysis exported: {complexity_path.name}")
+            func_dot_path = f"{report_base}functions-{date_tag}.dot"
+            job = export_pool.submit(_FUNC_EXPORTERS["dot"], function_map, func_dot_path)
+            export_jobs[job] = ("Function graph exported", "function graph", func_dot_path)
             
-            # Print brief summary
-            summary = complexity_data.get('complexity_summary', {})
-            high_complexity = summary.get('high_complexity', 0)
-            total_functions = summary.get('total_functions', 0)
-            if total_functions > 0:
-                print(f"   🎯 Complexity: {high_complexity}/{total_functions} functions need attention ({round(high_complexity/total_functions*100, 1)}%)")
-        except Exception as e:
-            print(f"   ⚠️  Warning: Complexity analysis failed: {e}")
-    
-    # Step 4: Database Detection
-    if config.enable_db_detection:
-        print("\n🗄️  Step 4: Detecting database operations...")
+            for job in as_completed(export_jobs):
+                message, label, path = export_jobs[job]
+                try:
+                    job.result()
+                    logger.info(f"   ✅ {message}: {os.path.basename(path)}")
+                except Exception as e:
+                    logger.info(f"   ⚠️  Warning: Could not export {label}: {e}")
+        
+        # Start steps 2-6 in parallel; results are reported below in step order
+        enabled_steps = [(name, runner) for name, flag, runner in ANALYSIS_STEPS if getattr(config, flag)]
+        futures = {}
+        executor = None
+        shm = None
+        # The shared memory block and the pool are released however the steps end
         try:
-            db_detector = DatabaseCallDetector(root_path, raw_data, config)
-            db_data = db_detector.detect_db_calls()
-            all_analysis_data['db_calls'] = db_data
+            if enabled_steps:
+                max_workers = min(len(enabled_steps), config.jobs)
+                # Analyzers start pools of their own on large trees; keep the total within --jobs
+                step_config = _step_config(config, max_workers)
+                # Hand raw_data to workers through shared memory instead of pickling it per task
+                shm, size = _share_raw_data(raw_data)
+                if shm is not None:
+                    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(shm.name, size))
+                    for name, runner in enabled_steps:
+                        futures[name] = executor.submit(_run_shared, runner, root_path, step_config)
+                else:
+                    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker_logging)
+                    for name, runner in enabled_steps:
+                        futures[name] = executor.submit(_run_timed, runner, root_path, raw_data, step_config)
             
-            db_path = output_dir / f"db-calls-{date_tag}.json"
-            with open(db_path, 'w', encoding='utf-8') as f:
-                json.dump({"database_analysis": db_data}, f, indent=2)
-            print(f"   ✅ Database analysis exported: {db_path.name}")
+            # Step 2: Metrics Analysis
+            if config.enable_metrics:
+                logger.info("\n📏 Step 2: Analyzing code metrics...")
+                with _guarded("Metrics analysis failed"):
+                    metrics_data = _step_result("metrics", futures['metrics'], timings)
+                    
+                    metrics_path = f"{report_base}metrics-{date_tag}.json"
+                    write_json({"metrics": metrics_data}, metrics_path, pretty=config.pretty_json)
+                    logger.info(f"   ✅ Metrics analysis exported: {os.path.basename(metrics_path)}")
+                    
+                    # Print brief summary
+                    summary = metrics_data.get('project_summary', {})
+                    logger.info(f"   📈 Project: {summary.get('total_files', 0)} files, {summary.get('total_lines_of_code', 0)} lines, {summary.get('total_functions', 0)} functions")
             
-            # Print brief summary
-            summary = db_data.get('database_summary', {})
-            db_modules = summary.get('modules_with_db_access', 0)
-            total_ops = summary.get('total_db_operations', 0)
-            if total_ops > 0:
-                print(f"   💾 Database: {total_ops} operations across {db_modules} modules")
-            else:
-                print(f"   💾 Database: No database operations detected")
-        except Exception as e:
-            print(f"   ⚠️  Warning: Database detection failed: {e}")
-    
-    # Step 5: Documentation Coverage
-    if config.enable_doc_coverage:
-        print("\n📚 Step 5: Analyzing documentation coverage...")
-        try:
-            doc_analyzer = DocCoverageAnalyzer(root_path, raw_data)
-            doc_data = doc_analyzer.analyze_documentation()
-            all_analysis_data['documentation'] = doc_data
+            # Step 3: Complexity Analysis
+            if config.enable_complexity:
+                logger.info("\n🧠 Step 3: Analyzing function complexity...")
+                with _guarded("Complexity analysis failed"):
+                    complexity_data = _step_result("complexity", futures['complexity'], timings)
+                    
+                    complexity_path = f"{report_base}complexity-{date_tag}.json"
+                    write_json({"complexity": complexity_data}, complexity_path, pretty=config.pretty_json)
+                    logger.info(f"   ✅ Complexity analysis exported: {os.path.basename(complexity_path)}")
+                    
+                    # Print brief summary
+                    summary = complexity_data.get('complexity_summary', {})
+                    high_complexity = summary.get('high_complexity', 0)
+                    total_functions = summary.get('total_functions', 0)
+                    if total_functions > 0:
+                        logger.info(f"   🎯 Complexity: {high_complexity}/{total_functions} functions need attention ({round(high_complexity/total_functions*100, 1)}%)")
             
-            doc_path = output_dir / f"doc-coverage-{date_tag}.json"
-            with open(doc_path, 'w', encoding='utf-8') as f:
-                json.dump({"documentation": doc_data}, f, indent=2)
-            print(f"   ✅ Documentation analysis exported: {doc_path.name}")
+            # Step 4: Database Detection
+            if config.enable_db_detection:
+                logger.info("\n🗄️  Step 4: Detecting database operations...")
+                with _guarded("Database detection failed"):
+                    db_data = _step_result("db_calls", futures['db_calls'], timings)
+                    
+                    db_path = f"{report_base}db-calls-{date_tag}.json"
+                    write_json({"database_analysis": db_data}, db_path, pretty=config.pretty_json)
+                    logger.info(f"   ✅ Database analysis exported: {os.path.basename(db_path)}")
+                    
+                    # Print brief summary
+                    summary = db_data.get('database_summary', {})
+                    db_modules = summary.get('modules_with_db_access', 0)
+                    total_ops = summary.get('total_db_operations', 0)
+                    if total_ops > 0:
+                        logger.info(f"   💾 Database: {total_ops} operations across {db_modules} modules")
+                    else:
+                        logger.info(f"   💾 Database: No database operations detected")
             
-            # Print brief summary
-            summary = doc_data.get('coverage_summary', {})
-            func_coverage = summary.get('function_coverage_percentage', 0)
-            quality = summary.get('overall_quality', 'Unknown')
-            print(f"   📖 Documentation: {func_coverage}% function coverage - {quality.lower()}")
-        except Exception as e:
-            print(f"   ⚠️  Warning: Documentation analysis failed: {e}")
+            # Step 5: Documentation Coverage
+            if config.enable_doc_coverage:
+                logger.info("\n📚 Step 5: Analyzing documentation coverage...")
+                with _guarded("Documentation analysis failed"):
+                    doc_data = _step_result("documentation", futures['documentation'], timings)
+                    
+                    doc_path = f"{report_base}doc-coverage-{date_tag}.json"
+                    write_json({"documentation": doc_data}, doc_path, pretty=config.pretty_json)
+                    logger.info(f"   ✅ Documentation analysis exported: {os.path.basename(doc_path)}")
+                    
+                    # Print brief summary
+                    summary = doc_data.get('coverage_summary', {})
+                    func_coverage = summary.get('function_coverage_percentage', 0)
+                    quality = summary.get('overall_quality', 'Unknown')
+                    logger.info(f"   📖 Documentation: {func_coverage}% function coverage - {quality.lower()}")
 
-    #Step 6: Database Architecture Compliance        
-    if config.enable_db_compliance:
-        print("\n🏗️  Step 6: Analyzing database architecture compliance...")
-        try:
-            compliance_analyzer = DatabaseComplianceAnalyzer(root_path, raw_data, config)
-            compliance_data = compliance_analyzer.analyze_compliance()
-            all_analysis_data['db_compliance'] = compliance_data
-            
-            compliance_path = output_dir / f"db-compliance-{date_tag}.json"
-            with open(compliance_path, 'w', encoding='utf-8') as f:
-                json.dump({"database_compliance": compliance_data}, f, indent=2)
-            print(f"   ✅ Database compliance analysis exported: {compliance_path.name}")
+            #Step 6: Database Architecture Compliance        
+            if config.enable_db_compliance:
+                logger.info("\n🏗️  Step 6: Analyzing database architecture compliance...")
+                with _guarded("Database compliance analysis failed"):
+                    compliance_data = _step_result("db_compliance", futures['db_compliance'], timings)
+                    
+                    compliance_path = f"{report_base}db-compliance-{date_tag}.json"
+                    write_json({"database_compliance": compliance_data}, compliance_path, pretty=config.pretty_json)
+                    logger.info(f"   ✅ Database compliance analysis exported: {os.path.basename(compliance_path)}")
+                    
+                    # Print brief summary
+                    summary = compliance_data.get('compliance_summary', {})
+                    overall_score = compliance_data.get('overall_architectural_score', 0)
+                    violations = summary.get('total_violations', 0)
+                    if violations > 0:
+                        logger.info(f"   🚨 Architecture: {overall_score:.1f}% compliance, {violations} violations need attention")
+                    else:
+                        logger.info(f"   ✅ Architecture: {overall_score:.1f}% compliance - excellent service layer usage!")
             
-            # Print brief summary
-            summary = compliance_data.get('compliance_summary', {})
-            overall_score = compliance_data.get('overall_architectural_score', 0)
-            violations = summary.get('total_violations', 0)
-            if violations > 0:
-                print(f"   🚨 Architecture: {overall_score:.1f}% compliance, {violations} violations need attention")
-            else:
-                print(f"   ✅ Architecture: {overall_score:.1f}% compliance - excellent service layer usage!")
-        except Exception as e:
-            print(f"   ⚠️  Warning: Database compliance analysis failed: {e}")
-    
-    # Step 7: Generate Summaries
-    if config.enable_summary:
-        print("\n📋 Step 7: Generating project summaries...")
-        try:
-            summarizer = ProjectSummarizer(all_analysis_data)
-            
-            # Generate main summary
-            summary_data = summarizer.generate_summary()
-            summary_path = output_dir / f"summary-{date_tag}.json"
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump({"project_summary": summary_data}, f, indent=2)
-            print(f"   ✅ Project summary exported: {summary_path.name}")
-            
-            # Generate LLM context
-            llm_context = summarizer.create_llm_context()
-            llm_path = output_dir / f"llm-context-{date_tag}.json"
-            with open(llm_path, 'w', encoding='utf-8') as f:
-                json.dump({"llm_context": llm_context}, f, indent=2)
-            print(f"   ✅ LLM context exported: {llm_path.name}")
-            
-        except Exception as e:
-            print(f"   ⚠️  Warning: Summary generation failed: {e}")
+        finally:
+            if executor is not None:
+                # Steps not yet started are dropped rather than run (KeyboardInterrupt)
+                for future in futures.values():
+                    future.cancel()
+                executor.shutdown()
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        
+        # Collect all analysis data in one go; failed steps are left out
+        all_analysis_data = {
+            'dependencies': dependency_map,
+            'functions': function_map,
+            **{name: future.result()[0] for name, future in futures.items() if future.exception() is None},
+            '_timings': timings
+        }
+        
+        # Step 7: Generate Summaries
+        if config.enable_summary:
+            logger.info("\n📋 Step 7: Generating project summaries...")
+            with _step("summary", timings), _guarded("Summary generation failed"):
+                from .summary import ProjectSummarizer
+                summarizer = ProjectSummarizer(all_analysis_data)
+                
+                # Generate main summary
+                summary_path = f"{report_base}summary-{date_tag}.json"
+                with open(summary_path, 'wb') as f:
+                    summarizer.stream_summary(f, pretty=config.pretty_json)
+                logger.info(f"   ✅ Project summary exported: {os.path.basename(summary_path)}")
+                
+                # Generate LLM context
+                llm_path = f"{report_base}llm-context-{date_tag}.json"
+                with open(llm_path, 'wb') as f:
+                    summarizer.stream_llm_context(f, pretty=config.pretty_json)
+                logger.info(f"   ✅ LLM context exported: {os.path.basename(llm_path)}")
+                
+        
+        if staging is not None:
+            bundle_path = bundle_reports(report_dir, output_dir / f"walk3r-{date_tag}", bundle)
+            logger.info(f"\n📦 Reports bundled into: {bundle_path.name}")
+    finally:
+        if staging is not None:
+            staging.cleanup()
     
     # Final summary
-    print(f"\n🎉 Long walk analysis complete!")
-    print(f"📁 All files saved to: {output_dir}")
-    print(f"💡 Pro tip: Check db-compliance-{date_tag}.json for architecture violations!")
-    print(f"💡 Upload summary-{date_tag}.json to ChatGPT/Claude to ask about your codebase!")
+    logger.info(f"\n🎉 Long walk analysis complete!")
+    logger.info(f"📁 All files saved to: {output_dir}")
+    logger.info(f"💡 Pro tip: Check db-compliance-{date_tag}.json for architecture violations!")
+    logger.info(f"💡 Upload summary-{date_tag}.json to ChatGPT/Claude to ask about your codebase!")
     
     return 0
 
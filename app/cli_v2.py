@@ -4,77 +4,166 @@ Walk3r 2.0 - Enhanced CLI Interface
 Easy-to-use static analysis tool for non-programmers and AI assistant integration
 """
 
+from __future__ import annotations
+
 import argparse
+import functools
+import importlib
+import importlib.util
 import sys
 import os
-import toml
-import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
-import webbrowser
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, List, NamedTuple, Optional, Tuple
 
-try:
-    from rich.console import Console
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-    from rich.panel import Panel
-    from rich.table import Table
-    from rich.prompt import Prompt, Confirm
-    from rich.text import Text
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
-    print("📦 Installing rich for better experience...")
-    os.system("pip install rich")
-    try:
-        from rich.console import Console
-        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-        from rich.panel import Panel
-        from rich.table import Table
-        from rich.prompt import Prompt, Confirm
-        from rich.text import Text
-        RICH_AVAILABLE = True
-    except ImportError:
-        RICH_AVAILABLE = False
+# rich is optional and only imported once something is actually rendered
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
 
-from .scanner import ModuleScanner
-from .linker import DependencyLinker
-from .exporter import export_json, export_csv, export_dot, export_function_map_json, export_function_dot
-from .config import Walk3rConfig
+if TYPE_CHECKING:
+    from .config import Walk3rConfig
 
-# Import analysis modules
-try:
-    from .metrics import MetricsAnalyzer
-    from .complexity import ComplexityAnalyzer
-    from .db_detector import DatabaseCallDetector
-    from .db_compliance import DatabaseComplianceAnalyzer
-    from .doc_coverage import DocCoverageAnalyzer
-    from .summary import ProjectSummarizer
-    LONG_WALK_AVAILABLE = True
-except ImportError as e:
-    LONG_WALK_AVAILABLE = False
+# Scanner, exporters and analysis modules are imported by the commands that
+# use them, so --help and setup stay cheap; an analyzer that fails to import
+# is skipped by its own step
+LONG_WALK_AVAILABLE = True
 
-console = Console() if RICH_AVAILABLE else None
+_console = None
+
+def _get_console():
+    """Return the shared rich Console, creating it on first use (None without rich)"""
+    global _console, RICH_AVAILABLE
+    if _console is None and RICH_AVAILABLE:
+        try:
+            from rich.console import Console
+            _console = Console()
+        except ImportError:
+            RICH_AVAILABLE = False
+    return _console
 
 def print_fancy(message: str, style: str = ""):
     """Print with rich formatting if available, otherwise plain text"""
-    if RICH_AVAILABLE and console:
+    console = _get_console()
+    if console:
         console.print(message, style=style)
     else:
         print(message)
 
 def print_panel(message: str, title: str = "", style: str = ""):
     """Print a panel with rich formatting if available"""
-    if RICH_AVAILABLE and console:
+    console = _get_console()
+    if console:
+        from rich.panel import Panel
         console.print(Panel(message, title=title, style=style))
     else:
         print(f"\n=== {title} ===")
         print(message)
         print("=" * (len(title) + 8))
 
+# Files that identify a project's layout
+COMMON_FILES = ("setup.py", "pyproject.toml", "requirements.txt", "__init__.py")
+
+# Overrides suggested for small projects; everything else comes from Walk3rConfig defaults
+SMALL_PROJECT_CONFIG = MappingProxyType({
+    "formats": ("json", "csv"),
+    "enable_db_compliance": False
+})
+
+# Toggles offered by manual_configuration
+ANALYSIS_OPTIONS = (
+    ("enable_complexity", "🧠 Complexity analysis"),
+    ("enable_db_detection", "🗄️ Database detection"),
+    ("enable_doc_coverage", "📚 Documentation coverage"),
+    ("enable_metrics", "📊 Code metrics"),
+    ("enable_summary", "📋 Summary generation"),
+    ("enable_db_compliance", "🏗️ Database compliance")
+)
+
+# Directories never worth descending into when sizing up a project
+SKIP_DIRS = {".git", ".hg", ".svn", ".venv", "venv", "__pycache__", "node_modules", ".tox", ".mypy_cache"}
+
+def _count_py_files(path: Path, cap: int = 101) -> int:
+    """Count .py files under path, stopping once cap is reached ("at least cap")"""
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for filename in filenames:
+            if filename.endswith(".py"):
+                count += 1
+                if count >= cap:
+                    return count
+    return count
+
+class _AnalyzerSpec(NamedTuple):
+    """How to run one analyzer and where its report goes"""
+    flag: str
+    description: str
+    module: str
+    class_name: str
+    method: str
+    report_prefix: str
+    report_key: str
+    result_key: str
+    takes_config: bool
+    caches: Tuple[str, ...]
+
+# Analyzers in run order; modules are imported only when their step runs
+_ANALYZERS = (
+    _AnalyzerSpec("enable_metrics", "📊 Analyzing metrics", "metrics", "MetricsAnalyzer",
+                  "analyze_metrics", "metrics", "metrics", "metrics", False, ("ast_cache", "source_cache", "ast_metrics")),
+    _AnalyzerSpec("enable_complexity", "🧠 Analyzing complexity", "complexity", "ComplexityAnalyzer",
+                  "analyze_complexity", "complexity", "complexity", "complexity", True, ("ast_cache", "ast_metrics", "source_cache")),
+    _AnalyzerSpec("enable_db_detection", "🗄️ Detecting database calls", "db_detector", "DatabaseCallDetector",
+                  "detect_db_calls", "db-calls", "database_analysis", "db_calls", True, ("ast_cache", "ast_metrics")),
+    _AnalyzerSpec("enable_doc_coverage", "📚 Analyzing documentation", "doc_coverage", "DocCoverageAnalyzer",
+                  "analyze_documentation", "doc-coverage", "documentation", "documentation", False, ("ast_cache", "source_cache", "ast_metrics")),
+    _AnalyzerSpec("enable_db_compliance", "🏗️ Checking compliance", "db_compliance", "DatabaseComplianceAnalyzer",
+                  "analyze_compliance", "db-compliance", "database_compliance", "db_compliance", True, ("source_cache",)),
+)
+
+class _PlainProgress:
+    """Stand-in for rich's Progress when stdout is not a terminal: prints each task once"""
+    
+    def __init__(self, console):
+        self.console = console
+        self.task_count = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def add_task(self, description: str, total: float = 100) -> int:
+        self.console.print(description)
+        self.task_count += 1
+        return self.task_count
+    
+    def update(self, task_id: int, **kwargs):
+        pass
+    
+    def advance(self, task_id: int, advance: float = 1):
+        pass
+
 class Walk3rCLI:
+    # console is a property over the shared lazy console, so it needs no slot
+    __slots__ = ("_run_ctx", "ast_cache", "ast_metrics", "source_cache", "_pending_reports")
+    
     def __init__(self):
-        self.console = console
+        self._run_ctx: Optional[Dict[str, Any]] = None
+        # Filled once per run so the analyzers share one read and parse of each file
+        self.source_cache: Dict[str, str] = {}
+        self.ast_cache: Dict[str, Any] = {}
+        # One combined tree walk per file, read by every AST-based analyzer
+        self.ast_metrics: Dict[str, Any] = {}
+        # Serialized reports waiting to be written together by _flush_reports
+        self._pending_reports: List[Tuple[Path, bytes]] = []
+        
+    @property
+    def console(self):
+        return _get_console()
         
     def auto_detect_project(self, path: str = ".") -> Dict[str, Any]:
         """Auto-detect project type and suggest configuration"""
@@ -87,47 +176,49 @@ class Walk3rCLI:
             "detected_files": []
         }
         
-        # Check for common project files
-        common_files = ["setup.py", "pyproject.toml", "requirements.txt", "__init__.py"]
-        found_files = [f for f in common_files if (path / f).exists()]
+        # Check for common project files with a single directory read
+        try:
+            with os.scandir(path) as it:
+                entries = {entry.name for entry in it}
+        except OSError:
+            entries = set()
+        found_files = [f for f in COMMON_FILES if f in entries]
         project_info["detected_files"] = found_files
         
-        # Count Python files
-        py_files = list(path.rglob("*.py"))
-        project_info["python_files_count"] = len(py_files)
+        # Count Python files (only as far as the size buckets below need)
+        py_count = _count_py_files(path)
+        project_info["python_files_count"] = py_count
         
         # Determine project type
-        if (path / "setup.py").exists() or (path / "pyproject.toml").exists():
+        if "setup.py" in entries or "pyproject.toml" in entries:
             project_info["project_type"] = "python_package"
-        elif (path / "__init__.py").exists():
+        elif "__init__.py" in entries:
             project_info["project_type"] = "python_module"
-        elif len(py_files) > 0:
+        elif py_count > 0:
             project_info["project_type"] = "python_scripts"
         
         # Suggest configuration
-        if len(py_files) < 10:
+        if py_count < 10:
             size = "small"
-        elif len(py_files) < 100:
+        elif py_count < 100:
             size = "medium"
         else:
             size = "large"
             
-        project_info["suggested_config"] = {
-            "root_path": str(path),
-            "output_dir": "./walk3r_reports",
-            "formats": ["json", "csv"] if size == "small" else ["json"],
-            "enable_complexity": True,
-            "enable_db_detection": True,
-            "enable_doc_coverage": True,
-            "enable_metrics": True,
-            "enable_summary": True,
-            "enable_db_compliance": size != "small"
-        }
+        suggested_config = {"root_path": str(path), "output_dir": "./walk3r_reports"}
+        if size == "small":
+            suggested_config["formats"] = list(SMALL_PROJECT_CONFIG["formats"])
+            suggested_config["enable_db_compliance"] = SMALL_PROJECT_CONFIG["enable_db_compliance"]
+        project_info["suggested_config"] = suggested_config
         
         return project_info
     
     def interactive_setup(self) -> Walk3rConfig:
         """Interactive configuration wizard"""
+        from .config import Walk3rConfig
+        if RICH_AVAILABLE:
+            from rich.prompt import Prompt, Confirm
+        
         print_panel("🚀 Welcome to Walk3r 2.0! Let's set up your analysis.", 
                    "Walk3r Setup Wizard", "bold blue")
         
@@ -148,7 +239,8 @@ class Walk3rCLI:
         project_info = self.auto_detect_project(project_path)
         
         print_fancy(f"🔍 Detected: {project_info['project_type']}")
-        print_fancy(f"📊 Found {project_info['python_files_count']} Python files")
+        py_count = project_info['python_files_count']
+        print_fancy(f"📊 Found {'100+' if py_count > 100 else py_count} Python files")
         
         if project_info["detected_files"]:
             print_fancy(f"📋 Project files: {', '.join(project_info['detected_files'])}")
@@ -186,6 +278,9 @@ class Walk3rCLI:
     
     def manual_configuration(self, project_info: Dict) -> Dict[str, Any]:
         """Manual configuration for advanced users"""
+        if RICH_AVAILABLE:
+            from rich.prompt import Prompt, Confirm
+        
         config = project_info["suggested_config"].copy()
         
         print_panel("🛠️ Manual Configuration", style="yellow")
@@ -200,16 +295,7 @@ class Walk3rCLI:
         config["output_dir"] = output_dir
         
         # Analysis options
-        analysis_options = [
-            ("enable_complexity", "🧠 Complexity analysis"),
-            ("enable_db_detection", "🗄️ Database detection"),
-            ("enable_doc_coverage", "📚 Documentation coverage"),
-            ("enable_metrics", "📊 Code metrics"),
-            ("enable_summary", "📋 Summary generation"),
-            ("enable_db_compliance", "🏗️ Database compliance")
-        ]
-        
-        for key, description in analysis_options:
+        for key, description in ANALYSIS_OPTIONS:
             if RICH_AVAILABLE:
                 config[key] = Confirm.ask(description, default=config.get(key, True))
             else:
@@ -224,20 +310,68 @@ class Walk3rCLI:
             "walk3r": config_dict
         }
         
-        with open("walk3r.toml", "w") as f:
-            toml.dump(config_content, f)
+        try:
+            import tomli_w
+            new_content = tomli_w.dumps(config_content).encode("utf-8")
+        except ImportError:
+            import toml
+            new_content = toml.dumps(config_content).encode("utf-8")
+        
+        # Leave an identical file untouched so its mtime doesn't churn watchers
+        config_path = Path("walk3r.toml")
+        try:
+            if config_path.read_bytes() == new_content:
+                return
+        except OSError:
+            pass
+        
+        tmp_path = config_path.with_suffix(".toml.tmp")
+        tmp_path.write_bytes(new_content)
+        os.replace(tmp_path, config_path)
+    
+    def _queue_report(self, path: Path, content: bytes):
+        """Hold a serialized report until _flush_reports writes the whole batch"""
+        self._pending_reports.append((path, content))
+    
+    def _flush_reports(self):
+        """Write all queued reports in one concurrent batch"""
+        from .exporter import write_files
+        reports, self._pending_reports = self._pending_reports, []
+        write_files(reports)
+    
+    def _start_run(self, config: Walk3rConfig):
+        """Fix the output directory and date tag once for every file this run writes"""
+        output_dir = Path(config.output_dir).resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self._run_ctx = {"output_dir": output_dir, "date_tag": datetime.now().strftime("%Y%m%d")}
+        return self._run_ctx["output_dir"], self._run_ctx["date_tag"]
     
     def run_analysis_with_progress(self, config: Walk3rConfig) -> int:
         """Run analysis with progress indicators"""
-        if not RICH_AVAILABLE:
+        console = _get_console()
+        if console is None:
             return self.run_analysis_simple(config)
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            console=console
-        ) as progress:
+        from .scanner import ModuleScanner
+        from .linker import DependencyLinker
+        from .exporter import export_dependencies, export_function_map_json, export_function_dot
+        from .config import available_cpus
+        from .source_cache import build_caches
+        from .ast_metrics import walk_trees
+        
+        if sys.stdout.isatty():
+            from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+            progress_display = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                console=console
+            )
+        else:
+            # Piped output: one line per step instead of repainting spinners
+            progress_display = _PlainProgress(console)
+        
+        with progress_display as progress:
             
             # Step 1: Module scanning
             task1 = progress.add_task("🔍 Scanning modules...", total=100)
@@ -252,28 +386,21 @@ class Walk3rCLI:
                 function_map = linker.get_function_map()
                 progress.update(task1, completed=100)
                 
-                console.print(f"✅ Found {len(raw_data)} modules with {sum(len(data.get('functions', {})) for data in raw_data.values())} functions")
+                console.print(f"✅ Found {len(raw_data)} modules with {scanner.stats['functions']} functions")
                 
             except Exception as e:
                 console.print(f"❌ Module scanning failed: {e}", style="red")
                 return 1
             
             # Export basic files
-            output_dir = Path(config.output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
-            date_tag = datetime.now().strftime("%Y%m%d")
+            output_dir, date_tag = self._start_run(config)
             
             task2 = progress.add_task("💾 Exporting basic files...", total=len(config.formats) + 2)
             
-            for fmt in config.formats:
-                output_path = output_dir / f"deps-{date_tag}.{fmt}"
-                if fmt == "json":
-                    export_json(dependency_map, output_path)
-                elif fmt == "csv":
-                    export_csv(dependency_map, output_path)
-                elif fmt == "dot":
-                    export_dot(dependency_map, output_path)
-                progress.advance(task2)
+            # All dependency formats are written in a single pass over the map
+            output_paths = {fmt: output_dir / f"deps-{date_tag}.{fmt}" for fmt in config.formats}
+            export_dependencies(dependency_map.items(), output_paths)
+            progress.advance(task2, len(config.formats))
             
             # Export function maps
             func_json_path = output_dir / f"functions-{date_tag}.json"
@@ -291,30 +418,49 @@ class Walk3rCLI:
             }
             
             # Run extended analysis
-            analysis_steps = []
-            if config.enable_metrics:
-                analysis_steps.append(("📊 Analyzing metrics", self.run_metrics_analysis))
-            if config.enable_complexity:
-                analysis_steps.append(("🧠 Analyzing complexity", self.run_complexity_analysis))
-            if config.enable_db_detection:
-                analysis_steps.append(("🗄️ Detecting database calls", self.run_db_detection))
-            if config.enable_doc_coverage:
-                analysis_steps.append(("📚 Analyzing documentation", self.run_doc_analysis))
-            if config.enable_db_compliance:
-                analysis_steps.append(("🏗️ Checking compliance", self.run_compliance_analysis))
-            if config.enable_summary:
-                analysis_steps.append(("📋 Generating summaries", self.run_summary_generation))
+            analysis_steps = [(spec.description, functools.partial(self.run_analyzer, spec))
+                              for spec in _ANALYZERS if getattr(config, spec.flag)]
             
-            for description, analysis_func in analysis_steps:
+            # The analyzers only read raw_data and each writes its own file, so
+            # they run side by side; results are merged here on the main thread
+            if analysis_steps:
+                self.source_cache, self.ast_cache = build_caches(config.root_path, raw_data)
+                self.ast_metrics = walk_trees(self.ast_cache)
+                max_workers = min(len(analysis_steps), config.jobs or available_cpus())
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    futures = {}
+                    for description, analysis_func in analysis_steps:
+                        task = progress.add_task(description, total=100)
+                        future = pool.submit(analysis_func, config, raw_data, output_dir, date_tag)
+                        futures[future] = (description, task)
+                    
+                    for future in as_completed(futures):
+                        description, task = futures[future]
+                        try:
+                            result = future.result()
+                            if result:
+                                all_analysis_data.update(result)
+                        except Exception as e:
+                            console.print(f"⚠️ {description} failed: {e}", style="yellow")
+                        progress.update(task, completed=100)
+                
+                # Reports are written as one batch once every analyzer is done
+                try:
+                    self._flush_reports()
+                except OSError as e:
+                    console.print(f"⚠️ Writing reports failed: {e}", style="yellow")
+            
+            # Summaries depend on the other results, so they run last
+            if config.enable_summary:
+                description = "📋 Generating summaries"
                 task = progress.add_task(description, total=100)
                 try:
-                    result = analysis_func(config, raw_data, output_dir, date_tag)
+                    result = self.run_summary_generation(config, raw_data, output_dir, date_tag)
                     if result:
                         all_analysis_data.update(result)
-                    progress.update(task, completed=100)
                 except Exception as e:
                     console.print(f"⚠️ {description} failed: {e}", style="yellow")
-                    progress.update(task, completed=100)
+                progress.update(task, completed=100)
         
         # Final summary
         self.show_completion_summary(output_dir, date_tag)
@@ -322,6 +468,10 @@ class Walk3rCLI:
     
     def run_analysis_simple(self, config: Walk3rConfig) -> int:
         """Simple analysis without progress bars"""
+        from .scanner import ModuleScanner
+        from .linker import DependencyLinker
+        from .exporter import export_dependencies
+        
         print_fancy("🚀 Starting Walk3r analysis...", "bold blue")
         
         # Basic scanning
@@ -340,105 +490,44 @@ class Walk3rCLI:
             return 1
         
         # Export files
-        output_dir = Path(config.output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        date_tag = datetime.now().strftime("%Y%m%d")
+        output_dir, date_tag = self._start_run(config)
         
         print_fancy("💾 Exporting files...")
-        for fmt in config.formats:
-            output_path = output_dir / f"deps-{date_tag}.{fmt}"
-            if fmt == "json":
-                export_json(dependency_map, output_path)
-            elif fmt == "csv":
-                export_csv(dependency_map, output_path)
-            elif fmt == "dot":
-                export_dot(dependency_map, output_path)
+        output_paths = {fmt: output_dir / f"deps-{date_tag}.{fmt}" for fmt in config.formats}
+        export_dependencies(dependency_map.items(), output_paths)
         
         print_fancy("✅ Analysis complete!")
         print_fancy(f"📁 Results saved to: {output_dir}")
         return 0
     
-    def run_metrics_analysis(self, config, raw_data, output_dir, date_tag):
-        """Run metrics analysis"""
-        if not LONG_WALK_AVAILABLE:
-            return None
-        
-        metrics_analyzer = MetricsAnalyzer(config.root_path, raw_data)
-        metrics_data = metrics_analyzer.analyze_metrics()
-        
-        metrics_path = output_dir / f"metrics-{date_tag}.json"
-        with open(metrics_path, 'w') as f:
-            json.dump({"metrics": metrics_data}, f, indent=2)
-        
-        return {"metrics": metrics_data}
-    
-    def run_complexity_analysis(self, config, raw_data, output_dir, date_tag):
-        """Run complexity analysis"""
-        if not LONG_WALK_AVAILABLE:
-            return None
-        
-        complexity_analyzer = ComplexityAnalyzer(config.root_path, raw_data, config)
-        complexity_data = complexity_analyzer.analyze_complexity()
-        
-        complexity_path = output_dir / f"complexity-{date_tag}.json"
-        with open(complexity_path, 'w') as f:
-            json.dump({"complexity": complexity_data}, f, indent=2)
-        
-        return {"complexity": complexity_data}
-    
-    def run_db_detection(self, config, raw_data, output_dir, date_tag):
-        """Run database detection"""
-        if not LONG_WALK_AVAILABLE:
-            return None
-        
-        db_detector = DatabaseCallDetector(config.root_path, raw_data, config)
-        db_data = db_detector.detect_db_calls()
-        
-        db_path = output_dir / f"db-calls-{date_tag}.json"
-        with open(db_path, 'w') as f:
-            json.dump({"database_analysis": db_data}, f, indent=2)
-        
-        return {"db_calls": db_data}
-    
-    def run_doc_analysis(self, config, raw_data, output_dir, date_tag):
-        """Run documentation analysis"""
-        if not LONG_WALK_AVAILABLE:
-            return None
-        
-        doc_analyzer = DocCoverageAnalyzer(config.root_path, raw_data)
-        doc_data = doc_analyzer.analyze_documentation()
-        
-        doc_path = output_dir / f"doc-coverage-{date_tag}.json"
-        with open(doc_path, 'w') as f:
-            json.dump({"documentation": doc_data}, f, indent=2)
-        
-        return {"documentation": doc_data}
-    
-    def run_compliance_analysis(self, config, raw_data, output_dir, date_tag):
-        """Run compliance analysis"""
-        if not LONG_WALK_AVAILABLE:
+    def run_analyzer(self, spec: _AnalyzerSpec, config, raw_data, output_dir, date_tag):
+        """Run one analyzer from _ANALYZERS, queue its report and return its results"""
+        try:
+            module = importlib.import_module(f".{spec.module}", __package__)
+        except ImportError:
             return None
+        from .exporter import dumps_json
         
-        compliance_analyzer = DatabaseComplianceAnalyzer(config.root_path, raw_data, config)
-        compliance_data = compliance_analyzer.analyze_compliance()
+        args = (config.root_path, raw_data, config) if spec.takes_config else (config.root_path, raw_data)
+        caches = {name: getattr(self, name) for name in spec.caches}
+        analyzer = getattr(module, spec.class_name)(*args, **caches)
+        data = getattr(analyzer, spec.method)()
         
-        compliance_path = output_dir / f"db-compliance-{date_tag}.json"
-        with open(compliance_path, 'w') as f:
-            json.dump({"database_compliance": compliance_data}, f, indent=2)
+        report_path = output_dir / f"{spec.report_prefix}-{date_tag}.json"
+        self._queue_report(report_path, dumps_json({spec.report_key: data}, pretty=config.pretty_json))
         
-        return {"db_compliance": compliance_data}
+        return {spec.result_key: data}
     
     def run_summary_generation(self, config, raw_data, output_dir, date_tag):
         """Run summary generation"""
-        if not LONG_WALK_AVAILABLE:
-            return None
-        
         # This would need the full analysis data
         return None
     
     def show_completion_summary(self, output_dir: Path, date_tag: str):
         """Show completion summary with helpful tips"""
-        if RICH_AVAILABLE:
+        console = _get_console()
+        if console:
+            from rich.table import Table
             table = Table(title="📊 Analysis Complete!")
             table.add_column("📁 File", style="cyan")
             table.add_column("📝 Description", style="green")
@@ -475,25 +564,31 @@ class Walk3rCLI:
         )
         
         # Ask if user wants to open results
-        if RICH_AVAILABLE:
+        if console:
+            from rich.prompt import Confirm
             open_results = Confirm.ask("🌐 Open results folder?", default=False)
             if open_results:
                 try:
                     if sys.platform == "win32":
                         os.startfile(output_dir)
-                    elif sys.platform == "darwin":
-                        os.system(f"open {output_dir}")
                     else:
-                        os.system(f"xdg-open {output_dir}")
-                except:
+                        # Launch the file manager detached, without a shell, and don't wait for it
+                        opener = "open" if sys.platform == "darwin" else "xdg-open"
+                        subprocess.Popen([opener, str(output_dir)], stdout=subprocess.DEVNULL,
+                                         stderr=subprocess.DEVNULL, start_new_session=True)
+                except OSError:
                     print_fancy(f"📁 Results are in: {output_dir}")
 
-def create_parser():
-    """Create argument parser with user-friendly commands"""
-    parser = argparse.ArgumentParser(
-        description="Walk3r 2.0 - Easy code analysis for everyone",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+COMMANDS = ("scan", "setup", "quick")
+
+def _sniff_subcommand(argv) -> Optional[str]:
+    """Return the first subcommand named in argv, or None if there is none"""
+    for arg in argv:
+        if arg in COMMANDS:
+            return arg
+    return None
+
+EXAMPLES_TEXT = """
 Examples:
   walk3r scan                    # Interactive setup and scan current directory
   walk3r scan /path/to/project   # Scan specific project
@@ -505,48 +600,64 @@ For AI assistants:
   
 Visit: https://github.com/elevend0g/walk3r for more info
         """
+
+def create_parser(only: Optional[str] = None, with_epilog: bool = True):
+    """Create argument parser with user-friendly commands (just the `only` subcommand if given)"""
+    parser = argparse.ArgumentParser(
+        description="Walk3r 2.0 - Easy code analysis for everyone",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EXAMPLES_TEXT if with_epilog else None
     )
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Scan command (main command)
-    scan_parser = subparsers.add_parser('scan', help='Analyze your project')
-    scan_parser.add_argument('path', nargs='?', default='.', 
-                           help='Project path to analyze (default: current directory)')
-    scan_parser.add_argument('--config', '-c', default='walk3r.toml',
-                           help='Configuration file (default: walk3r.toml)')
-    scan_parser.add_argument('--quick', '-q', action='store_true',
-                           help='Quick analysis with minimal output')
-    scan_parser.add_argument('--ai-ready', action='store_true',
-                           help='Generate files optimized for AI assistants')
-    scan_parser.add_argument('--no-setup', action='store_true',
-                           help='Skip interactive setup')
+    if only in (None, 'scan'):
+        scan_parser = subparsers.add_parser('scan', help='Analyze your project')
+        scan_parser.add_argument('path', nargs='?', default='.', 
+                               help='Project path to analyze (default: current directory)')
+        scan_parser.add_argument('--config', '-c', default='walk3r.toml',
+                               help='Configuration file (default: walk3r.toml)')
+        scan_parser.add_argument('--quick', '-q', action='store_true',
+                               help='Quick analysis with minimal output')
+        scan_parser.add_argument('--ai-ready', action='store_true',
+                               help='Generate files optimized for AI assistants')
+        scan_parser.add_argument('--no-setup', action='store_true',
+                               help='Skip interactive setup')
     
     # Setup command
-    setup_parser = subparsers.add_parser('setup', help='Configuration wizard')
-    setup_parser.add_argument('path', nargs='?', default='.',
-                            help='Project path to configure')
+    if only in (None, 'setup'):
+        setup_parser = subparsers.add_parser('setup', help='Configuration wizard')
+        setup_parser.add_argument('path', nargs='?', default='.',
+                                help='Project path to configure')
     
     # Quick command
-    quick_parser = subparsers.add_parser('quick', help='Quick analysis with defaults')
-    quick_parser.add_argument('path', nargs='?', default='.',
-                            help='Project path to analyze')
+    if only in (None, 'quick'):
+        quick_parser = subparsers.add_parser('quick', help='Quick analysis with defaults')
+        quick_parser.add_argument('path', nargs='?', default='.',
+                                help='Project path to analyze')
     
     return parser
 
 def main():
     """Main CLI entry point"""
-    parser = create_parser()
-    
     # If no arguments, show help and run interactive mode
     if len(sys.argv) == 1:
         print_panel("🚀 Welcome to Walk3r 2.0!", "Easy Code Analysis", "bold blue")
         print_fancy("No command specified. Running interactive mode...", "yellow")
         sys.argv.append('scan')  # Default to scan command
     
+    # Only build the subparser for the command actually requested, and only
+    # attach the examples epilog when help text may actually be shown
+    command = _sniff_subcommand(sys.argv[1:])
+    wants_help = command is None or "-h" in sys.argv or "--help" in sys.argv
+    parser = create_parser(only=command, with_epilog=wants_help)
     args = parser.parse_args()
     cli = Walk3rCLI()
     
+    if not RICH_AVAILABLE:
+        print("💡 Install rich for nicer output: pip install rich")
+    
     try:
         if args.command == 'setup':
             config = cli.interactive_setup()
@@ -554,6 +665,7 @@ def main():
             return 0
             
         elif args.command == 'scan':
+            from .config import Walk3rConfig
             # Check if config exists or if user wants interactive setup
             config_path = Path(args.config)
             config = None
@@ -565,8 +677,12 @@ def main():
                 # Load existing config or create default
                 if config_path.exists():
                     try:
-                        with open(config_path, 'r') as f:
-                            config_data = toml.load(f)['walk3r']
+                        try:
+                            import tomllib
+                        except ImportError:  # Python < 3.11
+                            import tomli as tomllib
+                        with open(config_path, 'rb') as f:
+                            config_data = tomllib.load(f)['walk3r']
                         config = Walk3rConfig(**config_data)
                         print_fancy(f"✅ Loaded configuration from {config_path}", "green")
                     except Exception as e:
@@ -584,6 +700,7 @@ def main():
             return cli.run_analysis_with_progress(config)
             
         elif args.command == 'quick':
+            from .config import Walk3rConfig
             # Quick analysis with minimal configuration
             project_info = cli.auto_detect_project(args.path)
             config_dict = project_info["suggested_config"]
@@ -1,14 +1,56 @@
 # complexity.py
 
 import ast
+import hashlib
+import itertools
+import json
+import logging
 import os
-from typing import Dict, List, Any, Tuple
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-from .config import should_ignore
+from .config import should_ignore, analyzer_jobs, cache_dir
+from .ast_metrics import UnifiedAstMetrics, collect_metrics
+from .source_cache import module_to_filepath
+from .parse_cache import content_digest
+
+logger = logging.getLogger("walk3r.complexity")
+
+# Issue type -> human-readable impact, for the report
+_IMPACTS = {
+    "function_length": "Hard to understand, test, and debug",
+    "parameter_count": "Difficult to call correctly, hard to remember parameter order",
+    "deep_nesting": "Complex logic flow, hard to follow and test all paths",
+    "high_complexity": "Very difficult to maintain, high risk of bugs"
+}
+_DEFAULT_IMPACT = "May impact code maintainability"
+
+# Complexity score -> level: 0-3 low, 4-7 medium, 8 and above high
+_COMPLEXITY_LEVELS = ("low",) * 4 + ("medium",) * 4 + ("high",)
+
+# overall_complexity level -> complexity_summary counter
+_SUMMARY_KEYS = {
+    "high": "high_complexity",
+    "medium": "medium_complexity",
+    "low": "low_complexity"
+}
+
+# Hotspots / medium-priority issues listed in the report
+MAX_LISTED_ISSUES = 10
+
+# Bump when per-module results change shape or meaning so stale cache entries are ignored
+RESULTS_CACHE_VERSION = 3
+
+# Below this many modules, starting worker processes costs more than it saves
+PARALLEL_MIN_MODULES = 100
 
 @dataclass
 class ComplexityIssue:
     """Represents a complexity issue found in code"""
+    __slots__ = ("location", "issue_type", "severity", "current_value", "threshold", "description", "suggestion")
+    
     location: str
     issue_type: str
     severity: str
@@ -20,60 +62,89 @@ class ComplexityIssue:
 class ComplexityAnalyzer:
     """Analyzes function complexity and identifies improvement opportunities"""
     
-    def __init__(self, root_path: str, module_data: Dict[str, Dict], config):
+    def __init__(self, root_path: str, module_data: Dict[str, Dict], config,
+                 ast_cache: Optional[Dict[str, ast.Module]] = None,
+                 ast_metrics: Optional[Dict[str, UnifiedAstMetrics]] = None,
+                 source_cache: Optional[Dict[str, str]] = None):
         self.root_path = root_path
         self.module_data = module_data
+        self.ast_cache = ast_cache
+        self.ast_metrics = ast_metrics
+        # The text ast_cache was parsed from, which keys the results cache for those trees
+        self.source_cache = source_cache
         self.max_function_length = getattr(config, 'max_function_length', 30)
         self.max_complexity_score = getattr(config, 'max_complexity_score', 10)
         self.max_parameter_count = getattr(config, 'max_parameter_count', 6)
+        self.jobs = analyzer_jobs(config)
         
     def analyze_complexity(self) -> Dict[str, Any]:
-        """Analyze complexity across all modules"""
-        try:
-            all_issues = []
-            function_analysis = {}
-            complexity_summary = {
-                "total_functions": 0,
-                "high_complexity": 0,
-                "medium_complexity": 0,
-                "low_complexity": 0
-            }
-            
-            for module_name in self.module_data.keys():
-                module_issues, module_functions = self._analyze_module_complexity(module_name)
-                all_issues.extend(module_issues)
-                if module_functions:
-                    function_analysis[module_name] = module_functions
-                    
-                # Update summary counts
-                for func_data in module_functions.values():
-                    complexity_summary["total_functions"] += 1
-                    if func_data["overall_complexity"] == "high":
-                        complexity_summary["high_complexity"] += 1
-                    elif func_data["overall_complexity"] == "medium":
-                        complexity_summary["medium_complexity"] += 1
-                    else:
-                        complexity_summary["low_complexity"] += 1
-            
-            # Sort issues by severity
-            high_priority = [issue for issue in all_issues if issue.severity == "high"]
-            medium_priority = [issue for issue in all_issues if issue.severity == "medium"]
-            
-            return {
-                "explanation": "This analysis identifies functions that might be too complex, making them harder to understand, test, and maintain. Focus on the high-priority issues first.",
-                "complexity_summary": complexity_summary,
-                "hotspots": self._format_issues_for_output(high_priority[:10]),
-                "medium_priority_issues": self._format_issues_for_output(medium_priority[:10]),
-                "well_structured_examples": self._find_good_examples(function_analysis),
-                "function_details": function_analysis,
-                "improvement_suggestions": self._generate_improvement_suggestions(all_issues)
-            }
+        """Analyze complexity across all modules (a module that fails is skipped with a warning)"""
+        # Only the first MAX_LISTED_ISSUES of each severity are reported; the rest are just counted
+        high_priority = []
+        medium_priority = []
+        high_count = medium_count = long_functions = 0
+        function_analysis = {}
+        complexity_summary = {
+            "total_functions": 0,
+            "high_complexity": 0,
+            "medium_complexity": 0,
+            "low_complexity": 0
+        }
+        
+        for module_name, (module_issues, module_functions) in zip(self.module_data.keys(), self._analyze_modules()):
+            # Sort issues by severity and count long functions as they arrive
+            for issue in module_issues:
+                if issue.severity == "high":
+                    high_count += 1
+                    if high_count <= MAX_LISTED_ISSUES:
+                        high_priority.append(issue)
+                elif issue.severity == "medium":
+                    medium_count += 1
+                    if medium_count <= MAX_LISTED_ISSUES:
+                        medium_priority.append(issue)
+                if issue.issue_type == "function_length":
+                    long_functions += 1
             
-        except Exception as e:
-            return {
-                "error": f"Complexity analysis failed: {str(e)}",
-                "explanation": "Unable to complete complexity analysis, but this won't affect other analysis modes."
+            if module_functions:
+                function_analysis[module_name] = module_functions
+                
+            # Update summary counts
+            for func_data in module_functions.values():
+                complexity_summary["total_functions"] += 1
+                complexity_summary[_SUMMARY_KEYS[func_data["overall_complexity"]]] += 1
+        
+        return {
+            "explanation": "This analysis identifies functions that might be too complex, making them harder to understand, test, and maintain. Focus on the high-priority issues first.",
+            "complexity_summary": complexity_summary,
+            "hotspots": self._format_issues_for_output(high_priority),
+            "medium_priority_issues": self._format_issues_for_output(medium_priority),
+            "well_structured_examples": self._find_good_examples(function_analysis),
+            "function_details": function_analysis,
+            "improvement_suggestions": self._generate_improvement_suggestions(
+                high_count, medium_count, long_functions)
+        }
+    
+    def _analyze_modules(self):
+        """Yield (issues, function_details) for each module, in module_data order"""
+        module_names = list(self.module_data.keys())
+        # jobs is the caller's process budget for this analyzer (1 when it already runs
+        # in a worker); trees already parsed in this process would have to be re-read
+        # by workers, so only fan out when nothing was handed to us either
+        if (self.ast_cache is None and self.ast_metrics is None and self.jobs > 1
+                and len(module_names) >= PARALLEL_MIN_MODULES):
+            thresholds = {
+                "max_function_length": self.max_function_length,
+                "max_complexity_score": self.max_complexity_score,
+                "max_parameter_count": self.max_parameter_count,
             }
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                yield from map(_intern_result, executor.map(
+                    _analyze_module_worker,
+                    [(self.root_path, name, thresholds) for name in module_names],
+                    chunksize=8))
+        else:
+            for module_name in module_names:
+                yield self._analyze_module_complexity(module_name)
     
     def _analyze_module_complexity(self, module_name: str) -> Tuple[List[ComplexityIssue], Dict]:
         """Analyze complexity for a single module"""
@@ -82,30 +153,32 @@ class ComplexityAnalyzer:
             if not file_path or not os.path.exists(file_path):
                 return [], {}
                 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
-                
-            tree = ast.parse(source)
-            visitor = ComplexityVisitor()
-            visitor.visit(tree)
+            cache_path = self._results_cache_path(module_name, file_path)
+            if cache_path is not None:
+                try:
+                    with open(cache_path, "r", encoding="utf-8") as f:
+                        cached = json.load(f)
+                    return _intern_result(([ComplexityIssue(*fields) for fields in cached["issues"]], cached["functions"]))
+                except Exception:
+                    pass  # Missing or corrupt entry: analyze and overwrite it
+            
+            metrics = collect_metrics(file_path, self.ast_cache, self.ast_metrics)
             
             issues = []
             function_details = {}
             
-            for func_name, data in visitor.functions.items():
+            # Calculate various complexity metrics: (lines, params, nesting, branches) per function
+            stats = [
+                (data['end_line'] - data['start_line'] + 1, len(data['parameters']), data['max_nesting'], data['branches'])
+                for data in metrics.functions.values()
+            ]
+            # Determine overall complexity for the whole module in one pass
+            scores = self._calculate_complexity_scores(stats)
+            
+            for func_name, (line_count, param_count, nesting_depth, branch_count), complexity_score in zip(
+                    metrics.functions, stats, scores):
                 full_name = f"{module_name}.{func_name}"
                 
-                # Calculate various complexity metrics
-                line_count = data['end_line'] - data['start_line'] + 1
-                param_count = len(data['parameters'])
-                nesting_depth = data['max_nesting']
-                branch_count = data['branches']
-                
-                # Determine overall complexity
-                complexity_score = self._calculate_complexity_score(
-                    line_count, param_count, nesting_depth, branch_count
-                )
-                
                 function_details[func_name] = {
                     "line_count": line_count,
                     "parameter_count": param_count,
@@ -160,34 +233,66 @@ class ComplexityAnalyzer:
                         suggestion="This function does too many things. Break it down into smaller, focused functions."
                     ))
             
+            if cache_path is not None:
+                try:
+                    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        json.dump({
+                            "issues": [[getattr(issue, name) for name in ComplexityIssue.__slots__] for issue in issues],
+                            "functions": function_details
+                        }, f)
+                    os.replace(tmp_path, cache_path)
+                except OSError:
+                    pass
+            
             return issues, function_details
             
         except Exception as e:
-            print(f"Warning: Could not analyze complexity for {module_name}: {e}")
+            logger.warning(f"Warning: Could not analyze complexity for {module_name}: {e}")
             return [], {}
     
+    def _source_digest(self, file_path: str) -> Optional[bytes]:
+        """Digest of the content this module's tree is (or will be) parsed from; None when a
+        tree was handed in without its source, as the file on disk may have changed since"""
+        if self.source_cache is not None and file_path in self.source_cache:
+            return content_digest(self.source_cache[file_path].encode())
+        if ((self.ast_cache is not None and file_path in self.ast_cache) or
+                (self.ast_metrics is not None and file_path in self.ast_metrics)):
+            return None
+        with open(file_path, "rb") as f:
+            return content_digest(f.read())
+    
+    def _results_cache_path(self, module_name: str, file_path: str):
+        """Disk cache entry for this module's results, keyed by its content, name and thresholds"""
+        try:
+            digest = self._source_digest(file_path)
+            if digest is None:
+                return None
+            key = hashlib.blake2b(digest_size=16)
+            key.update(f"walk3r-complexity-v{RESULTS_CACHE_VERSION}\n{module_name}\n".encode())
+            key.update(f"{self.max_function_length},{self.max_complexity_score},{self.max_parameter_count}\n".encode())
+            key.update(digest)
+            return cache_dir("complexity") / f"{key.hexdigest()}.json"
+        except OSError:
+            return None
+    
     def _module_to_filepath(self, module_name: str) -> str:
         """Convert module name back to file path"""
-        rel_path = module_name.replace('.', os.sep) + '.py'
-        return os.path.join(self.root_path, rel_path)
+        return module_to_filepath(self.root_path, module_name)
     
-    def _calculate_complexity_score(self, lines: int, params: int, nesting: int, branches: int) -> int:
-        """Calculate overall complexity score"""
-        score = 0
-        score += max(0, lines - 20) // 5  # Penalty for long functions
-        score += max(0, params - 3) * 2   # Penalty for many parameters
-        score += max(0, nesting - 2) * 3  # Penalty for deep nesting
-        score += max(0, branches - 5)     # Penalty for many branches
-        return score
+    def _calculate_complexity_scores(self, stats: List[Tuple[int, int, int, int]]) -> List[int]:
+        """Calculate overall complexity scores for (lines, params, nesting, branches) rows"""
+        return [
+            max(0, lines - 20) // 5       # Penalty for long functions
+            + max(0, params - 3) * 2      # Penalty for many parameters
+            + max(0, nesting - 2) * 3     # Penalty for deep nesting
+            + max(0, branches - 5)        # Penalty for many branches
+            for lines, params, nesting, branches in stats
+        ]
     
     def _categorize_complexity(self, score: int) -> str:
         """Categorize complexity level"""
-        if score <= 3:
-            return "low"
-        elif score <= 7:
-            return "medium"
-        else:
-            return "high"
+        return _COMPLEXITY_LEVELS[min(score, len(_COMPLEXITY_LEVELS) - 1)]
     
     def _format_issues_for_output(self, issues: List[ComplexityIssue]) -> List[Dict]:
         """Format issues for JSON output"""
@@ -204,49 +309,32 @@ class ComplexityAnalyzer:
     
     def _get_impact_description(self, issue_type: str) -> str:
         """Get human-readable impact description"""
-        impacts = {
-            "function_length": "Hard to understand, test, and debug",
-            "parameter_count": "Difficult to call correctly, hard to remember parameter order",
-            "deep_nesting": "Complex logic flow, hard to follow and test all paths",
-            "high_complexity": "Very difficult to maintain, high risk of bugs"
-        }
-        return impacts.get(issue_type, "May impact code maintainability")
+        return _IMPACTS.get(issue_type, _DEFAULT_IMPACT)
     
     def _find_good_examples(self, function_analysis: Dict) -> List[Dict]:
-        """Find examples of well-structured functions"""
-        good_examples = []
-        
-        for module, functions in function_analysis.items():
-            for func_name, data in functions.items():
-                if (data["overall_complexity"] == "low" and 
-                    data["line_count"] >= 5 and data["line_count"] <= 20):
-                    good_examples.append({
-                        "location": f"{module}.{func_name}",
-                        "reason": f"Well-sized function ({data['line_count']} lines) with good structure",
-                        "note": "Good example of appropriate function complexity"
-                    })
-                    
-                if len(good_examples) >= 3:
-                    break
-            if len(good_examples) >= 3:
-                break
-                
-        return good_examples
+        """Find examples of well-structured functions (the first three found)"""
+        good_examples = (
+            {
+                "location": f"{module}.{func_name}",
+                "reason": f"Well-sized function ({data['line_count']} lines) with good structure",
+                "note": "Good example of appropriate function complexity"
+            }
+            for module, functions in function_analysis.items()
+            for func_name, data in functions.items()
+            if data["overall_complexity"] == "low" and 5 <= data["line_count"] <= 20
+        )
+        return list(itertools.islice(good_examples, 3))
     
-    def _generate_improvement_suggestions(self, issues: List[ComplexityIssue]) -> List[str]:
-        """Generate general improvement suggestions"""
+    def _generate_improvement_suggestions(self, high_count: int, medium_count: int, long_functions: int) -> List[str]:
+        """Generate general improvement suggestions from issue counts"""
         suggestions = []
         
-        high_count = len([i for i in issues if i.severity == "high"])
-        medium_count = len([i for i in issues if i.severity == "medium"])
-        
         if high_count > 0:
             suggestions.append(f"Priority: Address {high_count} high-complexity functions first - these are the biggest maintenance risks.")
         
         if medium_count > 3:
             suggestions.append("Consider a gradual refactoring approach - tackle one complex function per development cycle.")
         
-        long_functions = len([i for i in issues if i.issue_type == "function_length"])
         if long_functions > 2:
             suggestions.append("Look for opportunities to extract reusable helper functions from long functions.")
         
@@ -256,85 +344,20 @@ class ComplexityAnalyzer:
         return suggestions
 
 
-class ComplexityVisitor(ast.NodeVisitor):
-    """AST visitor to analyze function complexity"""
-    
-    def __init__(self):
-        self.functions = {}
-        self.current_function = None
-        self.nesting_depth = 0
-        self.current_branches = 0
-        
-    def visit_FunctionDef(self, node):
-        # Store function info
-        self.functions[node.name] = {
-            'start_line': node.lineno,
-            'end_line': node.end_lineno or node.lineno,
-            'parameters': [arg.arg for arg in node.args.args],
-            'max_nesting': 0,
-            'branches': 0
-        }
-        
-        # Visit function body to analyze complexity
-        old_function = self.current_function
-        old_nesting = self.nesting_depth
-        old_branches = self.current_branches
-        
-        self.current_function = node.name
-        self.nesting_depth = 0
-        self.current_branches = 0
-        
-        self.generic_visit(node)
-        
-        # Store max values
-        self.functions[node.name]['max_nesting'] = self.nesting_depth
-        self.functions[node.name]['branches'] = self.current_branches
-        
-        # Restore previous state
-        self.current_function = old_function
-        self.nesting_depth = old_nesting
-        self.current_branches = old_branches
-    
-    def visit_AsyncFunctionDef(self, node):
-        self.visit_FunctionDef(node)  # Same logic as regular function
-    
-    def visit_If(self, node):
-        if self.current_function:
-            self.current_branches += 1
-            self.nesting_depth += 1
-            self.generic_visit(node)
-            self.nesting_depth -= 1
-        else:
-            self.generic_visit(node)
-    
-    def visit_For(self, node):
-        if self.current_function:
-            self.nesting_depth += 1
-            self.generic_visit(node)
-            self.nesting_depth -= 1
-        else:
-            self.generic_visit(node)
-    
-    def visit_While(self, node):
-        if self.current_function:
-            self.nesting_depth += 1
-            self.generic_visit(node)
-            self.nesting_depth -= 1
-        else:
-            self.generic_visit(node)
-    
-    def visit_Try(self, node):
-        if self.current_function:
-            self.nesting_depth += 1
-            self.generic_visit(node)
-            self.nesting_depth -= 1
-        else:
-            self.generic_visit(node)
-    
-    def visit_With(self, node):
-        if self.current_function:
-            self.nesting_depth += 1
-            self.generic_visit(node)
-            self.nesting_depth -= 1
-        else:
-            self.generic_visit(node)
\ No newline at end of file
+def _analyze_module_worker(args: Tuple[str, str, Dict[str, int]]) -> Tuple[List[ComplexityIssue], Dict]:
+    """Process-pool entry point: analyze one module with the given thresholds"""
+    root_path, module_name, thresholds = args
+    # jobs=1 so a worker never starts a pool of its own
+    analyzer = ComplexityAnalyzer(root_path, {}, SimpleNamespace(jobs=1, **thresholds))
+    return analyzer._analyze_module_complexity(module_name)
+
+def _intern_result(result: Tuple[List[ComplexityIssue], Dict]) -> Tuple[List[ComplexityIssue], Dict]:
+    """Intern the severity/type/level strings of a result unpickled or loaded from disk,
+    so they share the literals' objects and compare by identity first"""
+    issues, function_details = result
+    for issue in issues:
+        issue.severity = sys.intern(issue.severity)
+        issue.issue_type = sys.intern(issue.issue_type)
+    for data in function_details.values():
+        data["overall_complexity"] = sys.intern(data["overall_complexity"])
+    return result
@@ -1,11 +1,15 @@
 # config.py
 
+import multiprocessing
+import os
+import re
 from dataclasses import dataclass, field
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Optional
 
 # Future config structure for Walk3r dependency mapping
 
-DEFAULT_IGNORES = [
+DEFAULT_IGNORES = (
     "__init__",
     "tests",
     "site-packages", 
@@ -13,14 +17,17 @@ DEFAULT_IGNORES = [
     "__pycache__",
     "build",
     "dist"
-]
+)
 
-@dataclass
+# One alternation over all ignore fragments, so a path is scanned once in C
+_IGNORE_RE = re.compile("|".join(re.escape(ignored) for ignored in DEFAULT_IGNORES))
+
+@dataclass(frozen=True)
 class Walk3rConfig:
-    """Configuration for Walk3r analysis modes"""
+    """Configuration for Walk3r analysis modes (read-only; use dataclasses.replace to derive a variant)"""
     root_path: str
     output_dir: str
-    formats: List[str]
+    formats: List[str] = field(default_factory=lambda: ["json"])
     
     # Long walk mode settings
     enable_complexity: bool = True
@@ -48,6 +55,35 @@ class Walk3rConfig:
     # Database compliance patterns
     violation_patterns: Dict[str, List[str]] = field(default_factory=dict)
     service_patterns: Dict[str, List[str]] = field(default_factory=dict)
+    
+    # Indent JSON reports; set False for compact, machine-only output
+    pretty_json: bool = True
+    
+    # Worker processes/threads for parallel steps (None = all available CPUs)
+    jobs: Optional[int] = None
 
 def should_ignore(path: str) -> bool:
-    return any(ignored in path for ignored in DEFAULT_IGNORES)
+    """True if any DEFAULT_IGNORES fragment occurs anywhere in path"""
+    return _IGNORE_RE.search(path) is not None
+
+def available_cpus() -> int:
+    """Number of CPUs this process may run on, respecting affinity/cgroup masks"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def analyzer_jobs(config) -> int:
+    """Processes an analyzer may fan out to: config.jobs when the caller set it; unset,
+    every CPU at top level but 1 (no pool of its own) inside a worker process,
+    whose parent already owns the CPU budget"""
+    jobs = getattr(config, 'jobs', None)
+    if jobs:
+        return jobs
+    return 1 if multiprocessing.parent_process() is not None else available_cpus()
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) a walk3r cache directory under XDG_CACHE_HOME or ~/.cache"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = Path(base, "walk3r", *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,11 +1,28 @@
 # db_compliance.py
 
 import ast
+import functools
+import heapq
+import itertools
 import os
 import re
-from typing import Dict, List, Set, Any
-from dataclasses import dataclass
-from .config import should_ignore
+from collections import Counter
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Set, Any, Optional, Pattern, Tuple
+from dataclasses import dataclass, field
+from .config import should_ignore, analyzer_jobs
+from .source_cache import read_source, prefetch_sources, module_to_filepath
+from .parse_cache import content_digest
+
+# Below this many modules, starting worker processes costs more than it saves
+PARALLEL_MIN_MODULES = 100
+
+# Matches kept per module for the report; the rest are only counted
+MAX_LISTED_VIOLATIONS = 5
+MAX_LISTED_SERVICES = 3
 
 @dataclass
 class ComplianceMetrics:
@@ -15,21 +32,300 @@ class ComplianceMetrics:
     correct_service_calls: int
     direct_violations: int
     architectural_score: float
+    # The first matches only, in type, pattern, line order
     violation_details: List[Dict]
     service_usage: List[Dict]
+    # Every match, counted by violation / service type
+    violation_counts: Dict[str, int] = field(default_factory=dict)
+    service_counts: Dict[str, int] = field(default_factory=dict)
+
+# Plain characters and escaped punctuation only: such a pattern matches exactly one string
+_LITERAL_PATTERN = re.compile(r"(?:[A-Za-z0-9_ \-'\":,=/<>@!%&~;#]|\\[^A-Za-z0-9])*")
+
+def _as_literal(pattern: str) -> Optional[str]:
+    """The lowercased text an ASCII literal pattern stands for, or None if it uses any regex
+    syntax or is not a non-empty single-line string"""
+    if not pattern.isascii() or not _LITERAL_PATTERN.fullmatch(pattern):
+        return None
+    literal = re.sub(r"\\(.)", r"\1", pattern, flags=re.DOTALL).lower()
+    return literal if literal and '\n' not in literal else None
+
+# Tokens of a pattern that match one fixed character, or that match anything
+# variable-width without changing what the characters around them must be
+_REQUIRED_TOKEN = re.compile(r"[A-Za-z0-9_ \-'\":,=/<>@!%&~;]|\\[^A-Za-z0-9]|\\[dDsSwWbBAZ]|[.^$]|[*?+]")
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """The longest lowercased run of plain text that every match of an ASCII pattern must
+    contain, or None if there is none or the pattern uses groups, classes or alternation"""
+    if not pattern.isascii():
+        return None
+    runs = [""]
+    last_was_char = False
+    position = 0
+    for token in _REQUIRED_TOKEN.finditer(pattern):
+        if token.start() != position:
+            return None
+        position = token.end()
+        text = token.group()
+        if text in ("*", "?", "+"):
+            # A character under * or ? may be absent; under + it is still there once
+            if last_was_char and text != "+":
+                runs[-1] = runs[-1][:-1]
+            runs.append("")
+            last_was_char = False
+        elif len(text) == 1 and text not in ".^$" or text[0] == "\\" and not text[1].isalnum():
+            runs[-1] += text[-1]
+            last_was_char = True
+        else:
+            runs.append("")
+            last_was_char = False
+    if position != len(pattern):
+        return None
+    return max(runs, key=len).lower() or None
+
+# Escapes that mean the same regardless of case folding: classes, anchors and control characters
+_FOLDABLE_ESCAPES = frozenset("sSdDwWbBAZntrfva")
+# Group openings other than plain (...) that carry no flags or names
+_FOLDABLE_GROUP = re.compile(r"\(\?(?::|=|!|<=|<!)")
+
+def _case_folded(pattern: str) -> Optional[str]:
+    """A case-sensitive pattern matching lowercased ASCII text exactly where the ASCII pattern
+    matches it with IGNORECASE, or None if it uses classes, flags, names or numeric escapes"""
+    if not pattern.isascii():
+        return None
+    folded = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1:i + 2]
+            if escaped.isalnum() and escaped not in _FOLDABLE_ESCAPES:
+                return None
+            folded.append(pattern[i:i + 2])
+            i += 2
+        elif char == "[":
+            return None
+        elif pattern.startswith("(?", i):
+            group = _FOLDABLE_GROUP.match(pattern, i)
+            if group is None:
+                return None
+            folded.append(group.group())
+            i = group.end()
+        else:
+            folded.append(char.lower())
+            i += 1
+    return "".join(folded)
+
+def _fuse(patterns: List[str], flags: int = re.IGNORECASE) -> Optional[Pattern]:
+    """One alternation of the patterns, by default case-insensitive, or None if there are none or it does not compile"""
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
+    except re.error:
+        return None
+
+def _fuse_folded(patterns: List[str]) -> Optional[Pattern]:
+    """Case-sensitive alternation of the patterns' _case_folded forms, for lowercased ASCII
+    lines, or None if there are none or any of them cannot be folded; the IGNORECASE
+    alternation must then run on the original lines instead, as a scoped flag such as
+    (?-i:...) does not match the same on lowercased text"""
+    folded = [_case_folded(pattern) for pattern in patterns]
+    if not folded or None in folded:
+        return None
+    return _fuse(folded, 0)
+
+# Flags of a pattern compiled with IGNORECASE and no inline flags of its own
+_PLAIN_FLAGS = re.compile("", re.IGNORECASE).flags
+
+def _compile_category(patterns: List[str]) -> Tuple[Optional[Pattern], Optional[Pattern], List[Tuple]]:
+    """Compile one category into (prefilter, folded prefilter, [(regex, folded regex, pattern, fused, literal,
+    required), ...]), prefilter being one alternation of its fused patterns; the folded forms are for
+    lowercased ASCII lines, and None where a pattern cannot be folded"""
+    # Patterns with capture groups stay out of the alternation, where their group
+    # numbers and backreferences would shift, as do inline global flags, which
+    # would apply to the whole alternation; they are tried on every line instead
+    compiled = [(re.compile(pattern, re.IGNORECASE), pattern) for pattern in patterns]
+    fusable = [regex.groups == 0 and regex.flags == _PLAIN_FLAGS for regex, _ in compiled]
+    fused_patterns = [pattern for (_, pattern), ok in zip(compiled, fusable) if ok]
+    prefilter = _fuse(fused_patterns)
+    entries = []
+    for (regex, pattern), ok in zip(compiled, fusable):
+        # Without a folded form the IGNORECASE regex runs on the original line
+        case_folded = _case_folded(pattern)
+        folded_regex = re.compile(case_folded) if case_folded is not None else None
+        literal = _as_literal(pattern)
+        entries.append((regex, folded_regex, pattern, prefilter is not None and ok, literal,
+                        literal or _required_literal(pattern)))
+    return prefilter, _fuse_folded(fused_patterns), entries
+
+def _compile_line_filters(compiled: Dict[str, Tuple]) -> Tuple[Optional[Pattern], Optional[Pattern]]:
+    """(line filter, folded line filter): one alternation of every fused pattern across the
+    categories, which a line must match before any category's prefilter is tried on it"""
+    fused_patterns = [entry[2] for _, _, entries in compiled.values() for entry in entries if entry[3]]
+    line_filter = _fuse(fused_patterns)
+    return line_filter, _fuse_folded(fused_patterns)
+
+def _freeze_patterns(patterns: Dict[str, List[str]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Hashable copy of a type -> patterns mapping, keeping its order"""
+    return tuple((pattern_type, tuple(type_patterns)) for pattern_type, type_patterns in patterns.items())
+
+@functools.lru_cache(maxsize=32)
+def _build_scanners(frozen_patterns: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Tuple[Dict[str, Tuple], Optional[Pattern], Optional[Pattern]]:
+    """Compile a frozen pattern set into (type -> _compile_category result, line filter, folded line filter);
+    callers must not mutate it"""
+    compiled = {pattern_type: _compile_category(list(type_patterns)) for pattern_type, type_patterns in frozen_patterns}
+    return (compiled,) + _compile_line_filters(compiled)
+
+def _matching_lines(scanners: Tuple, content: str):
+    """Yield (type, pattern, line_num, line) for every line each pattern matches, in type, pattern, line order"""
+    compiled, line_filter, folded_line_filter = scanners
+    # For ASCII text, lower() agrees with re.IGNORECASE, so literal patterns are
+    # found with str.find on the lowercased file and never split it into lines,
+    # and foldable ones run case-sensitively on its lowercased lines; the rest
+    # (and filters including them) keep IGNORECASE on the original lines
+    folded = content.lower() if content.isascii() else None
+    nl_offsets = _newline_offsets(content) if folded is not None else None
+    line_filter_field = 1
+    if folded is not None:
+        if folded_line_filter is not None:
+            line_filter = folded_line_filter
+        else:
+            line_filter_field = 2
+    # (line_num, text searched when folded, line as written)
+    all_lines = None
+    likely_lines = None
+    
+    for pattern_type, (prefilter, folded_prefilter, patterns) in compiled.items():
+        prefilter_field = 1
+        if folded is not None:
+            if folded_prefilter is not None:
+                prefilter = folded_prefilter
+            else:
+                prefilter_field = 2
+        candidates = None
+        for regex, folded_regex, pattern, fused, literal, required in patterns:
+            field_index = 1
+            if folded is not None:
+                if literal is not None:
+                    for line_num, line in _literal_lines(content, folded, nl_offsets, literal):
+                        yield pattern_type, pattern, line_num, line
+                    continue
+                if required is not None and required not in folded:
+                    continue
+                if folded_regex is not None:
+                    regex = folded_regex
+                else:
+                    field_index = 2
+            if all_lines is None:
+                if folded is None:
+                    all_lines = [(line_num, line, line) for line_num, line in enumerate(content.split('\n'), 1)]
+                else:
+                    all_lines = list(zip(itertools.count(1), folded.split('\n'), content.split('\n')))
+            if fused:
+                if likely_lines is None:
+                    likely_lines = _candidate_lines(line_filter, all_lines, line_filter_field)
+                if candidates is None:
+                    candidates = _candidate_lines(prefilter, likely_lines, prefilter_field)
+                lines = candidates
+            else:
+                lines = all_lines
+            search = regex.search
+            for item in lines:
+                if search(item[field_index]):
+                    yield pattern_type, pattern, item[0], item[2]
+
+def _newline_offsets(content: str) -> array:
+    """Offsets of every newline in content, in order"""
+    offsets = array('q')
+    find = content.find
+    offset = find('\n')
+    while offset != -1:
+        offsets.append(offset)
+        offset = find('\n', offset + 1)
+    return offsets
+
+def _literal_lines(content: str, folded: str, nl_offsets: array, literal: str):
+    """Yield (line_num, line) once for each line of content whose lowercased text contains literal"""
+    find = folded.find
+    position = find(literal)
+    while position != -1:
+        index = bisect_right(nl_offsets, position)
+        start = nl_offsets[index - 1] + 1 if index else 0
+        end = nl_offsets[index] if index < len(nl_offsets) else len(content)
+        yield index + 1, content[start:end]
+        # Resume on the next line: one entry per line, as with per-line search
+        position = find(literal, end + 1)
+
+def _candidate_lines(prefilter: Optional[Pattern], numbered_lines: List[Tuple[int, str, str]],
+                     field_index: int = 1) -> List[Tuple[int, str, str]]:
+    """The lines on which at least one fused pattern matches, searching each line's
+    lowercased text (field 1) or the line as written (field 2)"""
+    if prefilter is None:
+        return numbered_lines
+    search = prefilter.search
+    return [item for item in numbered_lines if search(item[field_index])]
+
+@dataclass
+class ComplianceTotals:
+    """Project-wide sums over the modules with database operations, gathered in one pass"""
+    module_count: int = 0
+    score_sum: float = 0.0
+    total_operations: int = 0
+    total_violations: int = 0
+    total_correct: int = 0
+    critical: int = 0
+    warning: int = 0
+    good: int = 0
+    perfect: int = 0
+    # Each added module's architectural score, in the order added
+    scores: array = field(default_factory=lambda: array('d'))
+    # violation type / service pattern type -> matched lines, in first-seen order
+    violation_types: Counter = field(default_factory=Counter)
+    pattern_usage: Counter = field(default_factory=Counter)
+    
+    def add(self, metrics: ComplianceMetrics):
+        """Fold one module's metrics into the totals"""
+        score = metrics.architectural_score
+        self.module_count += 1
+        self.scores.append(score)
+        self.score_sum += score
+        self.total_operations += metrics.total_db_operations
+        self.total_violations += metrics.direct_violations
+        self.total_correct += metrics.correct_service_calls
+        if score < 50:
+            self.critical += 1
+        elif score < 80:
+            self.warning += 1
+        elif score < 100:
+            self.good += 1
+        elif score == 100:
+            self.perfect += 1
+        self.violation_types.update(metrics.violation_counts)
+        self.pattern_usage.update(metrics.service_counts)
 
 class DatabaseComplianceAnalyzer:
     """Analyzes database architecture compliance within Walk3r framework"""
     
-    def __init__(self, root_path: str, module_data: Dict[str, Dict], config):
+    def __init__(self, root_path: str, module_data: Dict[str, Dict], config,
+                 source_cache: Optional[Dict[str, str]] = None):
         self.root_path = root_path
         self.module_data = module_data
+        self.source_cache = source_cache
         self.config = config
+        self.jobs = analyzer_jobs(config)
         
         # Get patterns from config or use defaults
         self.violation_patterns = getattr(config, 'violation_patterns', self._default_violation_patterns())
         self.service_patterns = getattr(config, 'service_patterns', self._default_service_patterns())
         
+        # Compiled once per distinct pattern set and shared by every analyzer using it
+        self._violation_scanners = _build_scanners(_freeze_patterns(self.violation_patterns))
+        self._service_scanners = _build_scanners(_freeze_patterns(self.service_patterns))
+        
+        # module name -> (content digest, metrics) so repeat runs skip unchanged modules
+        self._cache: Dict[str, Tuple[bytes, Optional[ComplianceMetrics]]] = {}
+        
     def _default_violation_patterns(self) -> Dict[str, List[str]]:
         """Default violation patterns - can be overridden in config"""
         return {
@@ -96,21 +392,16 @@ class DatabaseComplianceAnalyzer:
         """Analyze database architecture compliance across all modules"""
         try:
             module_metrics = {}
-            total_violations = 0
-            total_correct = 0
-            total_modules_with_db = 0
+            totals = ComplianceTotals()
             
-            for module_name in self.module_data.keys():
-                metrics = self._analyze_module_compliance(module_name)
+            for module_name, metrics in zip(self.module_data.keys(), self._analyze_modules()):
                 if metrics and metrics.total_db_operations > 0:
                     module_metrics[module_name] = metrics
-                    total_violations += metrics.direct_violations
-                    total_correct += metrics.correct_service_calls
-                    total_modules_with_db += 1
+                    totals.add(metrics)
             
             # Calculate overall scores
-            overall_score = self._calculate_overall_score(module_metrics)
-            compliance_summary = self._generate_compliance_summary(module_metrics)
+            overall_score = self._calculate_overall_score(totals)
+            compliance_summary = self._generate_compliance_summary(totals)
             
             return {
                 "explanation": "This analysis evaluates how well your codebase follows proper database architecture patterns, distinguishing between direct database access (violations) and correct service layer usage.",
@@ -118,9 +409,9 @@ class DatabaseComplianceAnalyzer:
                 "overall_architectural_score": overall_score,
                 "module_compliance": {name: self._format_module_metrics(metrics) 
                                    for name, metrics in module_metrics.items()},
-                "violation_hotspots": self._identify_violation_hotspots(module_metrics),
-                "compliance_recommendations": self._generate_recommendations(module_metrics),
-                "architectural_patterns": self._analyze_architectural_patterns(module_metrics)
+                "violation_hotspots": self._identify_violation_hotspots(module_metrics, totals),
+                "compliance_recommendations": self._generate_recommendations(totals),
+                "architectural_patterns": self._analyze_architectural_patterns(totals)
             }
             
         except Exception as e:
@@ -129,24 +420,57 @@ class DatabaseComplianceAnalyzer:
                 "explanation": "Unable to complete compliance analysis, but this won't affect other analysis modes."
             }
     
-    def _analyze_module_compliance(self, module_name: str) -> ComplianceMetrics:
-        """Analyze compliance for a single module"""
+    def _analyze_modules(self):
+        """Yield each module's ComplianceMetrics (or None), in module_data order"""
+        module_names = list(self.module_data.keys())
+        # jobs is the caller's process budget for this analyzer (1 when it already runs
+        # in a worker); sources already read in this process would have to be re-read
+        # by workers, and memoized modules are cheaper to check here
+        if (self.source_cache is None and not self._cache and self.jobs > 1
+                and len(module_names) >= PARALLEL_MIN_MODULES):
+            with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                     initargs=(self.root_path, self.violation_patterns, self.service_patterns)) as executor:
+                for module_name, entry in zip(module_names, executor.map(_analyze_module_worker, module_names, chunksize=16)):
+                    if entry is None:
+                        yield None
+                    else:
+                        self._cache[module_name] = entry
+                        yield entry[1]
+        elif self.source_cache is None:
+            # Read ahead on threads so disk waits overlap the regex scans
+            file_paths = [module_to_filepath(self.root_path, name) for name in module_names]
+            for module_name, content in zip(module_names, prefetch_sources(file_paths)):
+                yield self._analyze_module_compliance(module_name, content)
+        else:
+            for module_name in module_names:
+                yield self._analyze_module_compliance(module_name)
+    
+    def _analyze_module_compliance(self, module_name: str, content: Optional[str] = None) -> ComplianceMetrics:
+        """Analyze compliance for a single module, given its already-read content if available"""
         try:
             file_path = self._module_to_filepath(module_name)
-            if not file_path or not os.path.exists(file_path):
+            if not file_path:
                 return None
                 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if content is None:
+                # Opening directly rather than checking first: one lookup, and no race
+                try:
+                    content = read_source(file_path, self.source_cache)
+                except FileNotFoundError:
+                    return None
+            digest = content_digest(content.encode())
+            cached = self._cache.get(module_name)
+            if cached is not None and cached[0] == digest:
+                return cached[1]
             
             # Find violations and correct usage
-            violations = self._find_violations(content)
-            service_usage = self._find_service_usage(content)
+            violation_counts, violations = self._find_violations(content)
+            service_counts, service_usage = self._find_service_usage(content)
             
             # Calculate metrics
-            total_ops = len(violations) + len(service_usage)
-            correct_ops = len(service_usage)
-            violation_count = len(violations)
+            violation_count = sum(violation_counts.values())
+            correct_ops = sum(service_counts.values())
+            total_ops = violation_count + correct_ops
             
             # Calculate architectural score (0-100)
             if total_ops == 0:
@@ -154,15 +478,19 @@ class DatabaseComplianceAnalyzer:
             else:
                 score = (correct_ops / total_ops) * 100
             
-            return ComplianceMetrics(
+            metrics = ComplianceMetrics(
                 module_name=module_name,
                 total_db_operations=total_ops,
                 correct_service_calls=correct_ops,
                 direct_violations=violation_count,
                 architectural_score=score,
                 violation_details=violations,
-                service_usage=service_usage
+                service_usage=service_usage,
+                violation_counts=violation_counts,
+                service_counts=service_counts
             )
+            self._cache[module_name] = (digest, metrics)
+            return metrics
             
         except Exception as e:
             print(f"Warning: Could not analyze compliance for {module_name}: {e}")
@@ -173,43 +501,43 @@ class DatabaseComplianceAnalyzer:
         rel_path = module_name.replace('.', os.sep) + '.py'
         return os.path.join(self.root_path, rel_path)
     
-    def _find_violations(self, content: str) -> List[Dict]:
-        """Find direct database access violations"""
+    def _find_violations(self, content: str, keep_details: int = MAX_LISTED_VIOLATIONS) -> Tuple[Dict[str, int], List[Dict]]:
+        """Find direct database access violations: (count per type, details of the first keep_details)"""
+        counts = {}
         violations = []
-        lines = content.split('\n')
         
-        for violation_type, patterns in self.violation_patterns.items():
-            for pattern in patterns:
-                for line_num, line in enumerate(lines, 1):
-                    if re.search(pattern, line, re.IGNORECASE):
-                        violations.append({
-                            'type': violation_type,
-                            'line': line_num,
-                            'code': line.strip(),
-                            'pattern': pattern,
-                            'severity': self._get_severity(violation_type),
-                            'suggestion': self._get_fix_suggestion(violation_type)
-                        })
+        for violation_type, pattern, line_num, line in _matching_lines(self._violation_scanners, content):
+            counts[violation_type] = counts.get(violation_type, 0) + 1
+            if len(violations) >= keep_details:
+                continue
+            violations.append({
+                'type': violation_type,
+                'line': line_num,
+                'code': line.strip(),
+                'pattern': pattern,
+                'severity': self._get_severity(violation_type),
+                'suggestion': self._get_fix_suggestion(violation_type)
+            })
         
-        return violations
+        return counts, violations
     
-    def _find_service_usage(self, content: str) -> List[Dict]:
-        """Find correct service layer usage"""
+    def _find_service_usage(self, content: str, keep_details: int = MAX_LISTED_SERVICES) -> Tuple[Dict[str, int], List[Dict]]:
+        """Find correct service layer usage: (count per type, details of the first keep_details)"""
+        counts = {}
         service_calls = []
-        lines = content.split('\n')
         
-        for service_type, patterns in self.service_patterns.items():
-            for pattern in patterns:
-                for line_num, line in enumerate(lines, 1):
-                    if re.search(pattern, line, re.IGNORECASE):
-                        service_calls.append({
-                            'type': service_type,
-                            'line': line_num,
-                            'code': line.strip(),
-                            'pattern': pattern
-                        })
+        for service_type, pattern, line_num, line in _matching_lines(self._service_scanners, content):
+            counts[service_type] = counts.get(service_type, 0) + 1
+            if len(service_calls) >= keep_details:
+                continue
+            service_calls.append({
+                'type': service_type,
+                'line': line_num,
+                'code': line.strip(),
+                'pattern': pattern
+            })
         
-        return service_calls
+        return counts, service_calls
     
     def _get_severity(self, violation_type: str) -> str:
         """Get severity level for violation type"""
@@ -231,39 +559,29 @@ class DatabaseComplianceAnalyzer:
         }
         return suggestions.get(violation_type, 'Consider using proper abstraction layers')
     
-    def _calculate_overall_score(self, module_metrics: Dict[str, ComplianceMetrics]) -> float:
+    def _calculate_overall_score(self, totals: ComplianceTotals) -> float:
         """Calculate overall architectural compliance score"""
-        if not module_metrics:
+        if not totals.module_count:
             return 100.0
         
-        total_ops = sum(m.total_db_operations for m in module_metrics.values())
-        total_correct = sum(m.correct_service_calls for m in module_metrics.values())
-        
-        return (total_correct / max(total_ops, 1)) * 100
+        return (totals.total_correct / max(totals.total_operations, 1)) * 100
     
-    def _generate_compliance_summary(self, module_metrics: Dict[str, ComplianceMetrics]) -> Dict[str, Any]:
+    def _generate_compliance_summary(self, totals: ComplianceTotals) -> Dict[str, Any]:
         """Generate compliance summary statistics"""
-        if not module_metrics:
+        if not totals.module_count:
             return {"message": "No modules with database operations found"}
         
-        scores = [m.architectural_score for m in module_metrics.values()]
-        
-        critical = len([m for m in module_metrics.values() if m.architectural_score < 50])
-        warning = len([m for m in module_metrics.values() if 50 <= m.architectural_score < 80])
-        good = len([m for m in module_metrics.values() if 80 <= m.architectural_score < 100])
-        perfect = len([m for m in module_metrics.values() if m.architectural_score == 100])
-        
         return {
-            "total_modules_with_db": len(module_metrics),
-            "average_compliance_score": round(sum(scores) / len(scores), 1),
+            "total_modules_with_db": totals.module_count,
+            "average_compliance_score": round(totals.score_sum / totals.module_count, 1),
             "compliance_distribution": {
-                "critical": critical,
-                "warning": warning, 
-                "good": good,
-                "perfect": perfect
+                "critical": totals.critical,
+                "warning": totals.warning, 
+                "good": totals.good,
+                "perfect": totals.perfect
             },
-            "total_violations": sum(m.direct_violations for m in module_metrics.values()),
-            "total_correct_patterns": sum(m.correct_service_calls for m in module_metrics.values())
+            "total_violations": totals.total_violations,
+            "total_correct_patterns": totals.total_correct
         }
     
     def _format_module_metrics(self, metrics: ComplianceMetrics) -> Dict[str, Any]:
@@ -273,21 +591,22 @@ class DatabaseComplianceAnalyzer:
             "total_operations": metrics.total_db_operations,
             "violations": metrics.direct_violations,
             "correct_patterns": metrics.correct_service_calls,
-            "violation_details": metrics.violation_details[:5],  # Limit to first 5
-            "service_patterns": metrics.service_usage[:3]  # Limit to first 3
+            "violation_details": metrics.violation_details[:MAX_LISTED_VIOLATIONS],
+            "service_patterns": metrics.service_usage[:MAX_LISTED_SERVICES]
         }
     
-    def _identify_violation_hotspots(self, module_metrics: Dict[str, ComplianceMetrics]) -> List[Dict]:
+    def _identify_violation_hotspots(self, module_metrics: Dict[str, ComplianceMetrics],
+                                     totals: ComplianceTotals) -> List[Dict]:
         """Identify modules that need immediate attention"""
         hotspots = []
         
-        # Sort by worst compliance score
-        sorted_modules = sorted(
-            module_metrics.items(),
-            key=lambda x: x[1].architectural_score
-        )
+        # Top 5 worst compliance scores, ties in module order as with a stable sort;
+        # totals.scores lines up with module_metrics' insertion order
+        scores = totals.scores
+        worst = heapq.nsmallest(5, range(len(scores)), key=scores.__getitem__)
+        items = list(module_metrics.items())
         
-        for module_name, metrics in sorted_modules[:5]:  # Top 5 worst
+        for module_name, metrics in (items[index] for index in worst):
             if metrics.architectural_score < 80:
                 hotspots.append({
                     "module": module_name,
@@ -299,42 +618,30 @@ class DatabaseComplianceAnalyzer:
         
         return hotspots
     
-    def _generate_recommendations(self, module_metrics: Dict[str, ComplianceMetrics]) -> List[str]:
+    def _generate_recommendations(self, totals: ComplianceTotals) -> List[str]:
         """Generate actionable recommendations"""
         recommendations = []
         
-        critical_modules = [m for m in module_metrics.values() if m.architectural_score < 50]
-        if critical_modules:
-            recommendations.append(f"URGENT: {len(critical_modules)} modules have critical compliance issues - refactor to use service layers")
-        
-        violation_types = {}
-        for metrics in module_metrics.values():
-            for violation in metrics.violation_details:
-                violation_types[violation['type']] = violation_types.get(violation['type'], 0) + 1
+        if totals.critical:
+            recommendations.append(f"URGENT: {totals.critical} modules have critical compliance issues - refactor to use service layers")
         
         # Top violation type
-        if violation_types:
-            top_violation = max(violation_types.items(), key=lambda x: x[1])
+        if totals.violation_types:
+            top_violation = totals.violation_types.most_common(1)[0]
             recommendations.append(f"Most common violation: {top_violation[0]} ({top_violation[1]} instances) - consider creating abstraction layer")
         
-        perfect_modules = [m for m in module_metrics.values() if m.architectural_score == 100]
-        if perfect_modules:
-            recommendations.append(f"{len(perfect_modules)} modules show perfect compliance - use as examples for refactoring")
+        if totals.perfect:
+            recommendations.append(f"{totals.perfect} modules show perfect compliance - use as examples for refactoring")
         
         return recommendations
     
-    def _analyze_architectural_patterns(self, module_metrics: Dict[str, ComplianceMetrics]) -> Dict[str, Any]:
+    def _analyze_architectural_patterns(self, totals: ComplianceTotals) -> Dict[str, Any]:
         """Analyze what architectural patterns are being used"""
-        pattern_usage = {}
-        
-        for metrics in module_metrics.values():
-            for service in metrics.service_usage:
-                pattern_type = service['type']
-                pattern_usage[pattern_type] = pattern_usage.get(pattern_type, 0) + 1
+        pattern_usage = totals.pattern_usage
         
         return {
-            "detected_patterns": pattern_usage,
-            "most_used_pattern": max(pattern_usage.items(), key=lambda x: x[1])[0] if pattern_usage else None,
+            "detected_patterns": dict(pattern_usage),
+            "most_used_pattern": pattern_usage.most_common(1)[0][0] if pattern_usage else None,
             "pattern_diversity": len(pattern_usage),
             "recommendation": self._recommend_architectural_pattern(pattern_usage)
         }
@@ -349,4 +656,20 @@ class DatabaseComplianceAnalyzer:
         elif 'repository_pattern' in patterns:
             return "Repository pattern detected - consider expanding to cover all data access"
         else:
-            return "Consider implementing consistent service layer pattern across all database operations"
\ No newline at end of file
+            return "Consider implementing consistent service layer pattern across all database operations"
+
+# Set in each worker process by _init_worker
+_worker_analyzer = None
+
+def _init_worker(root_path: str, violation_patterns: Dict[str, List[str]], service_patterns: Dict[str, List[str]]):
+    """Pool initializer: compile the patterns once per worker"""
+    global _worker_analyzer
+    # jobs=1 so a worker never starts a pool of its own
+    config = SimpleNamespace(jobs=1, violation_patterns=violation_patterns, service_patterns=service_patterns)
+    _worker_analyzer = DatabaseComplianceAnalyzer(root_path, {}, config)
+
+def _analyze_module_worker(module_name: str) -> Optional[Tuple[bytes, ComplianceMetrics]]:
+    """Process-pool entry point: (content digest, metrics) for one module, or None"""
+    if _worker_analyzer._analyze_module_compliance(module_name) is None:
+        return None
+    return _worker_analyzer._cache.pop(module_name)
@@ -1,14 +1,107 @@
 # db_detector.py
 
 import ast
+import functools
 import os
-from typing import Dict, List, Set, Any
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, FrozenSet, Any, Optional, Tuple
 from dataclasses import dataclass
-from .config import should_ignore
+from .config import should_ignore, analyzer_jobs
+from .ast_metrics import UnifiedAstMetrics, collect_metrics
+
+# Words marking an operation type as a read / a write (a type may contain both)
+_READ_WORDS = ("query", "find", "select", "get", "fetch", "read", "search")
+_WRITE_WORDS = ("insert", "update", "delete", "save", "create", "drop", "commit", "write")
+
+@functools.lru_cache(maxsize=None)
+def _operation_kind(op_type: str) -> Tuple[bool, bool]:
+    """(is read, is write) for an operation type; there are only a handful of distinct types"""
+    op_lower = op_type.lower()
+    return (any(word in op_lower for word in _READ_WORDS),
+            any(word in op_lower for word in _WRITE_WORDS))
+
+# SQL keywords, matched as substrings of the upper-cased text (upper() plus a
+# case-sensitive scan is faster than re.IGNORECASE); statements are what marks
+# a string argument as SQL
+_SQL_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+_SQL_KEYWORD_RE = re.compile("|".join(_SQL_STATEMENTS + ("CREATE", "DROP", "FROM", "WHERE")))
+_SQL_STATEMENT_RE = re.compile("|".join(_SQL_STATEMENTS))
+
+# Purpose guesses in priority order: the first entry with a word in the function
+# name wins, then the first with a word in the call itself
+_FUNCTION_PURPOSES = (
+    ("User authentication or verification", ("login", "auth", "verify")),
+    ("Creating new records", ("create", "add", "insert")),
+    ("Updating existing data", ("update", "modify", "edit")),
+    ("Removing data", ("delete", "remove")),
+    ("Retrieving data", ("get", "find", "fetch", "load")),
+)
+_CALL_PURPOSES = (
+    ("User data operations", ("user",)),
+    ("Business data operations", ("product", "item", "order")),
+)
+
+def _purpose_regex(purposes) -> "re.Pattern":
+    """One anchored scan over prioritized word lists: each branch is a lookahead
+    tried in order, so match.lastindex is the first entry with a word anywhere in
+    the text (a plain alternation would report the leftmost word instead)"""
+    return re.compile("^(?:" + "|".join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, words))}))()" for _, words in purposes
+    ) + ")", re.S)
+
+_FUNCTION_PURPOSE_RE = _purpose_regex(_FUNCTION_PURPOSES)
+_CALL_PURPOSE_RE = _purpose_regex(_CALL_PURPOSES)
+
+_DEFAULT_DB_METHODS = frozenset((
+    "execute", "query", "find", "insert", "update", "delete",
+    "save", "create", "drop", "select", "commit", "rollback"
+))
+_DEFAULT_DB_MODULES = frozenset((
+    "sqlite3", "sqlalchemy", "pymongo", "psycopg2", "mysql",
+    "redis", "cassandra", "elasticsearch", "django.db"
+))
+
+def _shared(names: FrozenSet[str]) -> FrozenSet[str]:
+    """The module-level default set when names equals it, else names"""
+    for default in (_DEFAULT_DB_METHODS, _DEFAULT_DB_MODULES):
+        if names == default:
+            return default
+    return names
+
+@functools.lru_cache(maxsize=8)
+def _build_matchers(db_methods: FrozenSet[str], db_modules: FrozenSet[str]) -> Tuple[Tuple[str, ...], Optional["re.Pattern"], "re.Pattern"]:
+    """(db module prefixes, method regex, raw-source prescan regex), built once per configuration"""
+    # str.startswith takes a tuple, testing an import against every module in one call
+    prefixes = tuple(sorted(db_modules))
+    # One scan telling whether any db method occurs in a lowercased call string;
+    # None when there are no methods (an empty alternation would match anything)
+    method_re = re.compile("|".join(
+        re.escape(method) for method in sorted(db_methods, key=len, reverse=True)
+    )) if db_methods else None
+    # Raw-source screen: a file whose lowercased bytes hold no db method, no db
+    # module name and no SQL statement keyword cannot yield an operation. Modules
+    # are screened on their first component, which any spelling of the import contains.
+    prescan_words = set(db_methods)
+    prescan_words.update(module.split('.')[0].lower() for module in db_modules)
+    prescan_words.update(keyword.lower() for keyword in _SQL_STATEMENTS)
+    prescan_words.discard('')
+    prescan_re = re.compile(b"|".join(
+        re.escape(word.encode()) for word in sorted(prescan_words, key=len, reverse=True)
+    ))
+    return prefixes, method_re, prescan_re
+
+# Below this many modules, starting worker processes costs more than it saves
+PARALLEL_MIN_MODULES = 100
 
 @dataclass
 class DatabaseOperation:
     """Represents a detected database operation"""
+    __slots__ = ("module", "function", "operation_type", "call_signature", "line_number", "purpose_guess")
+    
     module: str
     function: str
     operation_type: str
@@ -19,49 +112,51 @@ class DatabaseOperation:
 class DatabaseCallDetector:
     """Detects database operations and analyzes data access patterns"""
     
-    def __init__(self, root_path: str, module_data: Dict[str, Dict], config):
+    def __init__(self, root_path: str, module_data: Dict[str, Dict], config,
+                 ast_cache: Optional[Dict[str, ast.Module]] = None,
+                 ast_metrics: Optional[Dict[str, UnifiedAstMetrics]] = None):
         self.root_path = root_path
         self.module_data = module_data
-        self.db_methods = set(getattr(config, 'db_methods', [
-            "execute", "query", "find", "insert", "update", "delete",
-            "save", "create", "drop", "select", "commit", "rollback"
-        ]))
-        self.db_modules = set(getattr(config, 'db_modules', [
-            "sqlite3", "sqlalchemy", "pymongo", "psycopg2", "mysql",
-            "redis", "cassandra", "elasticsearch", "django.db"
-        ]))
+        self.ast_cache = ast_cache
+        self.ast_metrics = ast_metrics
+        self.jobs = analyzer_jobs(config)
+        # Lowercased once: they are only ever matched against lowercased call text.
+        # The defaults, and configs repeating them, share the module-level sets
+        self.db_methods = _shared(frozenset(method.lower() for method in getattr(config, 'db_methods', _DEFAULT_DB_METHODS)))
+        self.db_modules = _shared(frozenset(getattr(config, 'db_modules', _DEFAULT_DB_MODULES)))
+        self._db_module_prefixes, self._method_re, self._prescan_re = _build_matchers(self.db_methods, self.db_modules)
         
     def detect_db_calls(self) -> Dict[str, Any]:
         """Detect and analyze database operations across all modules"""
         try:
-            all_operations = []
-            modules_with_db = set()
+            operations_by_module = {}
+            total_operations = 0
+            read_count = 0
+            write_count = 0
+            sql_count = 0
             
-            for module_name in self.module_data.keys():
-                operations = self._analyze_module_db_calls(module_name)
+            # Group, classify and count in the one pass over each module's operations
+            for module_name, operations in zip(self.module_data.keys(), self._analyze_modules()):
                 if operations:
-                    all_operations.extend(operations)
-                    modules_with_db.add(module_name)
-            
-            # Categorize operations
-            read_ops = [op for op in all_operations if self._is_read_operation(op.operation_type)]
-            write_ops = [op for op in all_operations if self._is_write_operation(op.operation_type)]
-            
-            # Group by module
-            operations_by_module = self._group_operations_by_module(all_operations)
+                    data, reads, writes, sqls = self._group_module_operations(module_name, operations)
+                    operations_by_module[module_name] = data
+                    total_operations += len(operations)
+                    read_count += reads
+                    write_count += writes
+                    sql_count += sqls
             
             return {
                 "explanation": "This analysis shows all database operations in your codebase. Understanding data flow helps identify performance bottlenecks and ensures proper data handling.",
                 "database_summary": {
-                    "modules_with_db_access": len(modules_with_db),
-                    "total_db_operations": len(all_operations),
-                    "read_operations": len(read_ops),
-                    "write_operations": len(write_ops),
-                    "modules_list": sorted(list(modules_with_db))
+                    "modules_with_db_access": len(operations_by_module),
+                    "total_db_operations": total_operations,
+                    "read_operations": read_count,
+                    "write_operations": write_count,
+                    "modules_list": sorted(operations_by_module)
                 },
                 "db_operations_by_module": operations_by_module,
                 "architectural_analysis": self._analyze_architecture(operations_by_module),
-                "potential_issues": self._identify_potential_issues(all_operations),
+                "potential_issues": self._identify_potential_issues(total_operations, sql_count, operations_by_module),
                 "recommendations": self._generate_recommendations(operations_by_module)
             }
             
@@ -71,26 +166,77 @@ class DatabaseCallDetector:
                 "explanation": "Unable to complete database analysis, but this won't affect other analysis modes."
             }
     
+    def _analyze_modules(self):
+        """Yield the DatabaseOperation list of each module, in module_data order"""
+        module_names = list(self.module_data.keys())
+        # jobs is the caller's process budget for this analyzer (1 when it already runs
+        # in a worker); trees already parsed in this process would have to be re-read
+        # by workers, so only fan out when nothing was handed to us either
+        if (self.ast_cache is None and self.ast_metrics is None and self.jobs > 1
+                and len(module_names) >= PARALLEL_MIN_MODULES):
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                yield from executor.map(
+                    _analyze_module_worker,
+                    [(self.root_path, name, self.db_methods, self.db_modules) for name in module_names],
+                    chunksize=16)
+        else:
+            for module_name in module_names:
+                yield self._analyze_module_db_calls(module_name)
+    
     def _analyze_module_db_calls(self, module_name: str) -> List[DatabaseOperation]:
         """Analyze database calls in a single module"""
         try:
             file_path = self._module_to_filepath(module_name)
-            if not file_path or not os.path.exists(file_path):
-                return []
-                
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
+            
+            # Without an already parsed tree, screen the raw bytes before paying for a parse;
+            # the read doubles as the existence check
+            if not self._has_tree(file_path):
+                try:
+                    content = Path(file_path).read_bytes()
+                except FileNotFoundError:
+                    return []
+                if self._prescan_re.search(content.lower()) is None:
+                    return []
                 
-            tree = ast.parse(source)
-            visitor = DatabaseVisitor(self.db_methods, self.db_modules, module_name)
-            visitor.visit(tree)
+            metrics = collect_metrics(file_path, self.ast_cache, self.ast_metrics)
+            
+            # A call counts as database access once a database module has been imported above it
+            db_import_index = next((i for i, imp in enumerate(metrics.imports)
+                                    if imp.startswith(self._db_module_prefixes)),
+                                   len(metrics.imports))
             
-            return visitor.operations
+            # Check which calls look like database operations; only those are unparsed.
+            # Bound methods are looked up once, not per call node
+            match_database_call = self._match_database_call
+            get_call_tag = self._get_call_tag
+            return [
+                self._make_operation(module_name, node, function, method)
+                for node, function, imports_seen in metrics.calls
+                if (method := match_database_call(get_call_tag(node), node, imports_seen > db_import_index)) is not None
+            ]
             
         except Exception as e:
             print(f"Warning: Could not analyze database calls for {module_name}: {e}")
             return []
     
+    def _make_operation(self, module_name: str, node, function: str, method: str) -> DatabaseOperation:
+        """Describe one call already judged to be a database operation; method is the
+        db method it names ('' when it was judged one for another reason)"""
+        call_str = self._get_call_string(node)
+        return DatabaseOperation(
+            module=module_name,
+            function=function,
+            operation_type=method or self._extract_operation_type(call_str),
+            call_signature=call_str,
+            line_number=node.lineno,
+            purpose_guess=self._guess_purpose(call_str, function)
+        )
+    
+    def _has_tree(self, file_path: str) -> bool:
+        """Whether the file's tree or metrics were handed to us, making a prescan pointless"""
+        return ((self.ast_metrics is not None and file_path in self.ast_metrics) or
+                (self.ast_cache is not None and file_path in self.ast_cache))
+    
     def _module_to_filepath(self, module_name: str) -> str:
         """Convert module name back to file path"""
         rel_path = module_name.replace('.', os.sep) + '.py'
@@ -98,48 +244,49 @@ class DatabaseCallDetector:
     
     def _is_read_operation(self, op_type: str) -> bool:
         """Check if operation is a read operation"""
-        read_ops = {"query", "find", "select", "get", "fetch", "read", "search"}
-        return any(read_op in op_type.lower() for read_op in read_ops)
+        return _operation_kind(op_type)[0]
     
     def _is_write_operation(self, op_type: str) -> bool:
         """Check if operation is a write operation"""
-        write_ops = {"insert", "update", "delete", "save", "create", "drop", "commit", "write"}
-        return any(write_op in op_type.lower() for write_op in write_ops)
+        return _operation_kind(op_type)[1]
     
-    def _group_operations_by_module(self, operations: List[DatabaseOperation]) -> Dict[str, Dict]:
-        """Group operations by module for reporting"""
-        grouped = {}
-        
-        for op in operations:
-            if op.module not in grouped:
-                grouped[op.module] = {
-                    "operations": [],
-                    "operation_count": 0,
-                    "read_count": 0,
-                    "write_count": 0,
-                    "notes": ""
-                }
-            
-            grouped[op.module]["operations"].append({
-                "function": op.function,
-                "operation_type": op.operation_type,
-                "call_signature": op.call_signature,
-                "line_number": op.line_number,
-                "purpose": op.purpose_guess
-            })
-            
-            grouped[op.module]["operation_count"] += 1
-            
-            if self._is_read_operation(op.operation_type):
-                grouped[op.module]["read_count"] += 1
-            elif self._is_write_operation(op.operation_type):
-                grouped[op.module]["write_count"] += 1
-        
-        # Add architectural notes
-        for module, data in grouped.items():
-            data["notes"] = self._generate_module_notes(module, data)
-        
-        return grouped
+    def _group_module_operations(self, module: str, operations: List[DatabaseOperation]) -> Tuple[Dict, int, int, int]:
+        """Report entry for one module's operations, plus its (read, write, possible SQL) counts;
+        an operation may count as both read and write there, but only as one in the entry"""
+        # Tally from the column of operation types, classifying each distinct type once
+        module_reads = 0
+        module_writes = 0
+        reads = 0
+        writes = 0
+        for op_type, count in Counter([op.operation_type for op in operations]).items():
+            is_read, is_write = _operation_kind(op_type)
+            reads += is_read * count
+            writes += is_write * count
+            if is_read:
+                module_reads += count
+            elif is_write:
+                module_writes += count
+        sqls = sum(1 for op in operations if self._might_be_sql(op.call_signature))
+        
+        # Row dicts are only built for the report itself
+        entries = [{
+            "function": op.function,
+            "operation_type": op.operation_type,
+            "call_signature": op.call_signature,
+            "line_number": op.line_number,
+            "purpose": op.purpose_guess
+        } for op in operations]
+        
+        data = {
+            "operations": entries,
+            "operation_count": len(entries),
+            "read_count": module_reads,
+            "write_count": module_writes,
+            "notes": ""
+        }
+        # Architectural notes need the final counts
+        data["notes"] = self._generate_module_notes(module, data)
+        return data, reads, writes, sqls
     
     def _generate_module_notes(self, module: str, data: Dict) -> str:
         """Generate notes about module's database usage"""
@@ -202,34 +349,29 @@ class DatabaseCallDetector:
         else:
             return "Poor - database access is scattered across many modules"
     
-    def _identify_potential_issues(self, operations: List[DatabaseOperation]) -> List[str]:
+    def _identify_potential_issues(self, operation_count: int, sql_count: int,
+                                   operations_by_module: Dict[str, Dict]) -> List[str]:
         """Identify potential database-related issues"""
         issues = []
         
         # Check for SQL injection risks
-        sql_operations = [op for op in operations if self._might_be_sql(op.call_signature)]
-        if sql_operations:
-            issues.append(f"Found {len(sql_operations)} potential SQL operations - ensure proper parameter binding to prevent SQL injection")
+        if sql_count:
+            issues.append(f"Found {sql_count} potential SQL operations - ensure proper parameter binding to prevent SQL injection")
         
         # Check for modules with many DB operations
-        module_counts = {}
-        for op in operations:
-            module_counts[op.module] = module_counts.get(op.module, 0) + 1
-        
-        heavy_modules = [module for module, count in module_counts.items() if count > 15]
+        heavy_modules = [module for module, data in operations_by_module.items() if data["operation_count"] > 15]
         if heavy_modules:
             issues.append(f"Modules with many DB operations: {', '.join(heavy_modules)} - consider performance optimization")
         
         # Check for missing error handling patterns
-        if len(operations) > 5:
+        if operation_count > 5:
             issues.append("With multiple database operations, ensure proper error handling and transaction management")
         
         return issues
     
     def _might_be_sql(self, call_signature: str) -> bool:
         """Check if a call signature might involve SQL"""
-        sql_keywords = ["SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "FROM", "WHERE"]
-        return any(keyword in call_signature.upper() for keyword in sql_keywords)
+        return _SQL_KEYWORD_RE.search(call_signature.upper()) is not None
     
     def _generate_recommendations(self, operations_by_module: Dict) -> List[str]:
         """Generate recommendations for database architecture"""
@@ -253,54 +395,6 @@ class DatabaseCallDetector:
             recommendations.append("Database access patterns look well-organized")
         
         return recommendations
-
-
-class DatabaseVisitor(ast.NodeVisitor):
-    """AST visitor to detect database operations"""
-    
-    def __init__(self, db_methods: Set[str], db_modules: Set[str], module_name: str):
-        self.db_methods = db_methods
-        self.db_modules = db_modules
-        self.module_name = module_name
-        self.operations = []
-        self.current_function = "module_level"
-        self.imports = set()
-        
-    def visit_Import(self, node):
-        for alias in node.names:
-            self.imports.add(alias.name)
-        self.generic_visit(node)
-    
-    def visit_ImportFrom(self, node):
-        if node.module:
-            self.imports.add(node.module)
-        self.generic_visit(node)
-    
-    def visit_FunctionDef(self, node):
-        old_function = self.current_function
-        self.current_function = node.name
-        self.generic_visit(node)
-        self.current_function = old_function
-    
-    def visit_AsyncFunctionDef(self, node):
-        self.visit_FunctionDef(node)
-    
-    def visit_Call(self, node):
-        call_str = self._get_call_string(node)
-        
-        # Check if this looks like a database operation
-        if self._is_database_call(call_str, node):
-            operation = DatabaseOperation(
-                module=self.module_name,
-                function=self.current_function,
-                operation_type=self._extract_operation_type(call_str),
-                call_signature=call_str,
-                line_number=node.lineno,
-                purpose_guess=self._guess_purpose(call_str, self.current_function)
-            )
-            self.operations.append(operation)
-        
-        self.generic_visit(node)
     
     def _get_call_string(self, node) -> str:
         """Extract call signature as string"""
@@ -315,35 +409,62 @@ class DatabaseVisitor(ast.NodeVisitor):
             else:
                 return "unknown_call"
     
-    def _is_database_call(self, call_str: str, node) -> bool:
-        """Determine if a call is likely a database operation"""
-        # Check method names
-        for method in self.db_methods:
-            if method in call_str.lower():
-                return True
+    def _get_call_tag(self, node) -> str:
+        """Dotted name a call invokes, e.g. conn.cursor.execute, without formatting its arguments"""
+        parts = []
+        func = node.func
+        while True:
+            if isinstance(func, ast.Attribute):
+                parts.append(func.attr)
+                func = func.value
+            elif isinstance(func, ast.Name):
+                parts.append(func.id)
+                break
+            elif isinstance(func, ast.Call):
+                func = func.func
+            elif isinstance(func, ast.Subscript):
+                func = func.value
+            else:
+                break
+        return ".".join(reversed(parts))
+    
+    def _match_database_call(self, call_tag: str, node, db_imported: bool) -> Optional[str]:
+        """Determine if a call is likely a database operation, from its dotted name and arguments.
+        Returns the db method it names, '' when it is one for another reason, else None."""
+        # Check method names: the called name itself first, then the leftmost
+        # (longest at that position) method anywhere in the dotted path
+        call_lower = call_tag.lower()
+        called = call_lower.rpartition('.')[2]
+        if called in self.db_methods:
+            return called
+        if self._method_re is not None:
+            match = self._method_re.search(call_lower)
+            if match:
+                return match.group()
         
         # Check if calling methods on imported database modules
-        for db_module in self.db_modules:
-            if any(imp.startswith(db_module) for imp in self.imports):
-                return True
+        if db_imported:
+            return ''
         
         # Check for SQL-like strings in arguments
         if hasattr(node, 'args'):
             for arg in node.args:
                 if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
-                    if any(keyword in arg.value.upper() for keyword in ["SELECT", "INSERT", "UPDATE", "DELETE"]):
-                        return True
+                    if _SQL_STATEMENT_RE.search(arg.value.upper()):
+                        return ''
         
-        return False
+        return None
     
     def _extract_operation_type(self, call_str: str) -> str:
         """Extract the type of database operation"""
         call_lower = call_str.lower()
         
-        # Try to identify specific operation types
-        for method in self.db_methods:
-            if method in call_lower:
-                return method
+        # Try to identify specific operation types: the leftmost method in the call,
+        # longest first where several start there
+        if self._method_re is not None:
+            match = self._method_re.search(call_lower)
+            if match:
+                return match.group()
         
         # Check for SQL keywords
         sql_keywords = {
@@ -363,23 +484,17 @@ class DatabaseVisitor(ast.NodeVisitor):
     
     def _guess_purpose(self, call_str: str, function_name: str) -> str:
         """Guess the purpose of the database operation"""
-        call_lower = call_str.lower()
-        func_lower = function_name.lower()
-        
-        # Common patterns
-        if any(word in func_lower for word in ["login", "auth", "verify"]):
-            return "User authentication or verification"
-        elif any(word in func_lower for word in ["create", "add", "insert"]):
-            return "Creating new records"
-        elif any(word in func_lower for word in ["update", "modify", "edit"]):
-            return "Updating existing data"
-        elif any(word in func_lower for word in ["delete", "remove"]):
-            return "Removing data"
-        elif any(word in func_lower for word in ["get", "find", "fetch", "load"]):
-            return "Retrieving data"
-        elif "user" in call_lower:
-            return "User data operations"
-        elif any(word in call_lower for word in ["product", "item", "order"]):
-            return "Business data operations"
-        else:
-            return "General database operation"
\ No newline at end of file
+        match = _FUNCTION_PURPOSE_RE.match(function_name.lower())
+        if match:
+            return _FUNCTION_PURPOSES[match.lastindex - 1][0]
+        match = _CALL_PURPOSE_RE.match(call_str.lower())
+        if match:
+            return _CALL_PURPOSES[match.lastindex - 1][0]
+        return "General database operation"
+
+def _analyze_module_worker(args: Tuple[str, str, FrozenSet[str], FrozenSet[str]]) -> List[DatabaseOperation]:
+    """Process-pool entry point: detect one module's database operations"""
+    root_path, module_name, db_methods, db_modules = args
+    # jobs=1 so a worker never starts a pool of its own
+    detector = DatabaseCallDetector(root_path, {}, SimpleNamespace(jobs=1, db_methods=db_methods, db_modules=db_modules))
+    return detector._analyze_module_db_calls(module_name)
@@ -5,6 +5,8 @@ import os
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from .config import should_ignore
+from .source_cache import read_source
+from .ast_metrics import UnifiedAstMetrics, collect_metrics
 
 @dataclass
 class DocumentationIssue:
@@ -18,9 +20,14 @@ class DocumentationIssue:
 class DocCoverageAnalyzer:
     """Analyzes documentation coverage including docstrings, type hints, and comments"""
     
-    def __init__(self, root_path: str, module_data: Dict[str, Dict]):
+    def __init__(self, root_path: str, module_data: Dict[str, Dict],
+                 ast_cache: Optional[Dict[str, ast.Module]] = None, source_cache: Optional[Dict[str, str]] = None,
+                 ast_metrics: Optional[Dict[str, UnifiedAstMetrics]] = None):
         self.root_path = root_path
         self.module_data = module_data
+        self.ast_cache = ast_cache
+        self.source_cache = source_cache
+        self.ast_metrics = ast_metrics
         
     def analyze_documentation(self) -> Dict[str, Any]:
         """Analyze documentation coverage across all modules"""
@@ -76,19 +83,15 @@ class DocCoverageAnalyzer:
             if not file_path or not os.path.exists(file_path):
                 return {}, []
                 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
-                
-            tree = ast.parse(source)
-            visitor = DocumentationVisitor(module_name)
-            visitor.visit(tree)
+            source = read_source(file_path, self.source_cache)
+            visitor = collect_metrics(file_path, self.ast_cache, self.ast_metrics)
             
             # Calculate coverage statistics
-            total_functions = len(visitor.functions)
-            documented_functions = len([f for f in visitor.functions.values() if f["has_docstring"]])
+            total_functions = len(visitor.doc_functions)
+            documented_functions = len([f for f in visitor.doc_functions.values() if f["has_docstring"]])
             
-            total_classes = len(visitor.classes)
-            documented_classes = len([c for c in visitor.classes.values() if c["has_docstring"]])
+            total_classes = len(visitor.doc_classes)
+            documented_classes = len([c for c in visitor.doc_classes.values() if c["has_docstring"]])
             
             function_coverage = (documented_functions / max(total_functions, 1)) * 100
             class_coverage = (documented_classes / max(total_classes, 1)) * 100
@@ -125,7 +128,7 @@ class DocCoverageAnalyzer:
         issues = []
         
         # Check for missing module docstring
-        if visitor.module_docstring is None and len(visitor.functions) > 3:
+        if visitor.module_docstring is None and len(visitor.doc_functions) > 3:
             issues.append(DocumentationIssue(
                 location=module_name,
                 issue_type="missing_module_docstring",
@@ -135,7 +138,7 @@ class DocCoverageAnalyzer:
             ))
         
         # Check undocumented functions
-        for func_name, func_data in visitor.functions.items():
+        for func_name, func_data in visitor.doc_functions.items():
             if not func_data["has_docstring"] and func_data["line_count"] > 5:
                 issues.append(DocumentationIssue(
                     location=f"{module_name}.{func_name}",
@@ -156,7 +159,7 @@ class DocCoverageAnalyzer:
                 ))
         
         # Check undocumented classes
-        for class_name, class_data in visitor.classes.items():
+        for class_name, class_data in visitor.doc_classes.items():
             if not class_data["has_docstring"]:
                 issues.append(DocumentationIssue(
                     location=f"{module_name}.{class_name}",
@@ -170,11 +173,11 @@ class DocCoverageAnalyzer:
     
     def _assess_type_hint_usage(self, visitor) -> str:
         """Assess type hint usage quality"""
-        total_functions = len(visitor.functions)
+        total_functions = len(visitor.doc_functions)
         if total_functions == 0:
             return "No functions to analyze"
         
-        type_hinted_functions = len([f for f in visitor.functions.values() if f["has_type_hints"]])
+        type_hinted_functions = len([f for f in visitor.doc_functions.values() if f["has_type_hints"]])
         coverage = (type_hinted_functions / total_functions) * 100
         
         if coverage >= 80:
@@ -210,7 +213,7 @@ class DocCoverageAnalyzer:
         score += (function_coverage / 100) * 40
         
         # Class documentation (30 points)
-        if visitor.classes:
+        if visitor.doc_classes:
             score += (class_coverage / 100) * 30
         else:
             # If no classes, redistribute points to functions
@@ -221,9 +224,9 @@ class DocCoverageAnalyzer:
             score += 15
         
         # Type hints (15 points)
-        total_functions = len(visitor.functions)
+        total_functions = len(visitor.doc_functions)
         if total_functions > 0:
-            type_hinted = len([f for f in visitor.functions.values() if f["has_type_hints"]])
+            type_hinted = len([f for f in visitor.doc_functions.values() if f["has_type_hints"]])
             score += (type_hinted / total_functions) * 15
         
         return {
@@ -320,94 +323,3 @@ class DocCoverageAnalyzer:
             recommendations.append("Focus on documenting the most complex parts of your codebase first")
         
         return recommendations
-
-
-class DocumentationVisitor(ast.NodeVisitor):
-    """AST visitor to analyze documentation coverage"""
-    
-    def __init__(self, module_name: str):
-        self.module_name = module_name
-        self.module_docstring = None
-        self.functions = {}
-        self.classes = {}
-        self.current_class = None
-        
-    def visit_Module(self, node):
-        # Check for module docstring
-        if (node.body and isinstance(node.body[0], ast.Expr) and 
-            isinstance(node.body[0].value, ast.Constant) and 
-            isinstance(node.body[0].value.value, str)):
-            self.module_docstring = node.body[0].value.value
-        
-        self.generic_visit(node)
-    
-    def visit_FunctionDef(self, node):
-        func_info = self._analyze_function(node)
-        
-        if self.current_class:
-            # This is a method
-            method_name = f"{self.current_class}.{node.name}"
-            self.functions[method_name] = func_info
-        else:
-            # This is a module-level function
-            self.functions[node.name] = func_info
-        
-        self.generic_visit(node)
-    
-    def visit_AsyncFunctionDef(self, node):
-        self.visit_FunctionDef(node)
-    
-    def visit_ClassDef(self, node):
-        old_class = self.current_class
-        self.current_class = node.name
-        
-        # Analyze class documentation
-        class_info = self._analyze_class(node)
-        self.classes[node.name] = class_info
-        
-        self.generic_visit(node)
-        self.current_class = old_class
-    
-    def _analyze_function(self, node) -> Dict[str, Any]:
-        """Analyze a function for documentation"""
-        # Check for docstring
-        has_docstring = (
-            node.body and isinstance(node.body[0], ast.Expr) and
-            isinstance(node.body[0].value, ast.Constant) and
-            isinstance(node.body[0].value.value, str)
-        )
-        
-        # Check for type hints
-        has_return_annotation = node.returns is not None
-        has_param_annotations = any(arg.annotation is not None for arg in node.args.args)
-        has_type_hints = has_return_annotation or has_param_annotations
-        
-        # Calculate line count
-        line_count = (node.end_lineno or node.lineno) - node.lineno + 1
-        
-        return {
-            "has_docstring": has_docstring,
-            "has_type_hints": has_type_hints,
-            "has_return_annotation": has_return_annotation,
-            "has_param_annotations": has_param_annotations,
-            "parameter_count": len(node.args.args),
-            "line_count": line_count
-        }
-    
-    def _analyze_class(self, node) -> Dict[str, Any]:
-        """Analyze a class for documentation"""
-        # Check for class docstring
-        has_docstring = (
-            node.body and isinstance(node.body[0], ast.Expr) and
-            isinstance(node.body[0].value, ast.Constant) and
-            isinstance(node.body[0].value.value, str)
-        )
-        
-        # Count methods
-        method_count = len([n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))])
-        
-        return {
-            "has_docstring": has_docstring,
-            "method_count": method_count,
-            "line_count": (node.end_lineno or node.lineno) - node.lineno + 1
-        }
\ No newline at end of file
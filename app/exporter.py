@@ -2,12 +2,87 @@
 
 import json
 import csv
+import sqlite3
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict, Set
+from typing import Any, BinaryIO, Dict, Iterable, List, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def write_json(data: Any, output_path: str, pretty: bool = True):
+    """Write data as JSON (indented unless pretty is False), using orjson when it is installed;
+    non-ASCII text is written as UTF-8 either way, as orjson does"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        Path(output_path).write_bytes(orjson.dumps(data, option=option))
+    elif pretty:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+
+def dumps_json(data: Any, pretty: bool = True) -> bytes:
+    """Serialize data as JSON bytes (indented unless pretty is False), using orjson when it is installed;
+    non-ASCII text is UTF-8 either way, matching write_json"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0))
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def write_files(files: List[Tuple[str, bytes]]):
+    """Write several (path, content) pairs concurrently so their I/O overlaps"""
+    if not files:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(files), 8)) as pool:
+        # list() re-raises the first write error, if any
+        list(pool.map(lambda item: Path(item[0]).write_bytes(item[1]), files))
+
+class JsonObjectWriter:
+    """Stream a JSON object one member at a time, laid out exactly as write_json would at the given depth"""
+    
+    def __init__(self, f: BinaryIO, depth: int = 0, pretty: bool = True):
+        self.f = f
+        self.pretty = pretty
+        # Compact output has no layout at all, so nothing to indent by
+        self.newline = b"\n" + b"  " * depth if pretty else b""
+        self.member_indent = self.newline + b"  " if pretty else b""
+        self.key_separator = b": " if pretty else b":"
+        self.empty = True
+        f.write(b"{")
+    
+    def add(self, key: str, value: Any):
+        body = dumps_json(value, pretty=self.pretty)
+        if self.pretty:
+            # Re-indent the serialized value so it nests under this object
+            body = body.replace(b"\n", self.member_indent)
+        self.f.write((b"" if self.empty else b",") + self.member_indent + dumps_json(key) + self.key_separator + body)
+        self.empty = False
+    
+    def close(self):
+        self.f.write(b"}" if self.empty else self.newline + b"}")
+
+def write_json_sections(f: BinaryIO, root_key: str, sections: Iterable[Tuple[str, Any]], pretty: bool = True):
+    """Stream {root_key: {key: value, ...}} to a binary file, serializing one section at a time,
+    in the layout write_json would use for the same pretty setting"""
+    if pretty:
+        f.write(b'{\n  ' + dumps_json(root_key) + b': ')
+    else:
+        f.write(b'{' + dumps_json(root_key) + b':')
+    writer = JsonObjectWriter(f, depth=1, pretty=pretty)
+    for key, value in sections:
+        writer.add(key, value)
+    writer.close()
+    f.write(b"\n}" if pretty else b"}")
 
 def export_json(dependency_map: Dict[str, Dict[str, Set[str]]], output_path: str):
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump({k: {ik: list(iv) for ik, iv in v.items()} for k, v in dependency_map.items()}, f, indent=2)
+    write_json({k: {ik: list(iv) for ik, iv in v.items()} for k, v in dependency_map.items()}, output_path)
 
 def export_csv(dependency_map: Dict[str, Dict[str, Set[str]]], output_path: str):
     with open(output_path, "w", newline="", encoding="utf-8") as f:
@@ -30,9 +105,41 @@ def export_dot(dependency_map: Dict[str, Dict[str, Set[str]]], output_path: str)
                 f.write(f'  "{source}" -> "{target}" [label="call"];\n')
         f.write("}\n")
 
+def export_dependencies(links: Iterable[Tuple[str, Dict[str, Set[str]]]], output_paths: Dict[str, str]):
+    """Write the json/csv/dot dependency exports named in output_paths in one pass over links"""
+    with ExitStack() as stack:
+        json_writer = csv_writer = dot_file = None
+        if "json" in output_paths:
+            json_writer = JsonObjectWriter(stack.enter_context(open(output_paths["json"], "wb")))
+        if "csv" in output_paths:
+            csv_writer = csv.writer(stack.enter_context(open(output_paths["csv"], "w", newline="", encoding="utf-8")))
+            csv_writer.writerow(["Source", "Type", "Target"])
+        if "dot" in output_paths:
+            dot_file = stack.enter_context(open(output_paths["dot"], "w", encoding="utf-8"))
+            dot_file.write("digraph G {\n")
+            dot_file.write("  rankdir=LR;\n  node [shape=box, style=rounded, fontname=Courier, fontsize=10];\n")
+        
+        for source, source_links in links:
+            if json_writer is not None:
+                json_writer.add(source, {ik: list(iv) for ik, iv in source_links.items()})
+            if csv_writer is not None:
+                for target in source_links.get("imports", []):
+                    csv_writer.writerow([source, "import", target])
+                for target in source_links.get("calls", []):
+                    csv_writer.writerow([source, "call", target])
+            if dot_file is not None:
+                for target in source_links.get("imports", []):
+                    dot_file.write(f'  "{source}" -> "{target}" [label="import"];\n')
+                for target in source_links.get("calls", []):
+                    dot_file.write(f'  "{source}" -> "{target}" [label="call"];\n')
+        
+        if json_writer is not None:
+            json_writer.close()
+        if dot_file is not None:
+            dot_file.write("}\n")
+
 def export_function_map_json(function_map: Dict[str, Dict[str, Set[str]]], output_path: str):
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump({k: {fn: list(calls) for fn, calls in v.items()} for k, v in function_map.items()}, f, indent=2)
+    write_json({k: {fn: list(calls) for fn, calls in v.items()} for k, v in function_map.items()}, output_path)
 
 def export_function_dot(function_map: Dict[str, Dict[str, Set[str]]], output_path: str):
     with open(output_path, "w", encoding="utf-8") as f:
@@ -44,3 +151,25 @@ def export_function_dot(function_map: Dict[str, Dict[str, Set[str]]], output_pat
                 for call in calls:
                     f.write(f'  "{full_func}" -> "{call}";\n')
         f.write("}\n")
+
+def bundle_reports(report_dir: Path, bundle_base: Path, kind: str) -> Path:
+    """Pack every report file in report_dir into a single .tar.gz or .sqlite bundle"""
+    reports = sorted(path for path in Path(report_dir).iterdir() if path.is_file())
+    if kind == "tar":
+        bundle_path = bundle_base.with_name(bundle_base.name + ".tar.gz")
+        with tarfile.open(bundle_path, "w:gz") as tar:
+            for path in reports:
+                tar.add(path, arcname=path.name)
+    elif kind == "sqlite":
+        bundle_path = bundle_base.with_name(bundle_base.name + ".sqlite")
+        conn = sqlite3.connect(bundle_path)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS reports (name TEXT PRIMARY KEY, blob BLOB)")
+                conn.executemany("INSERT OR REPLACE INTO reports (name, blob) VALUES (?, ?)",
+                                 ((path.name, path.read_bytes()) for path in reports))
+        finally:
+            conn.close()
+    else:
+        raise ValueError(f"Unknown bundle type: {kind}")
+    return bundle_path
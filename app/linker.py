@@ -1,6 +1,6 @@
 # linker.py
 
-from typing import Dict, Set
+from typing import Dict, Iterator, Set, Tuple
 
 class DependencyLinker:
     def __init__(self, module_data: Dict[str, Dict]):
@@ -9,6 +9,12 @@ class DependencyLinker:
         self.function_map: Dict[str, Dict[str, Set[str]]] = {}
 
     def resolve_links(self) -> Dict[str, Dict[str, Set[str]]]:
+        for _ in self.iter_links():
+            pass
+        return self.linked_map
+
+    def iter_links(self) -> Iterator[Tuple[str, Dict[str, Set[str]]]]:
+        """Resolve links module by module, yielding (module, links) as each one is done"""
         for module, data in self.module_data.items():
             self.linked_map[module] = {
                 "imports": set(),
@@ -25,7 +31,7 @@ class DependencyLinker:
             if "functions" in data:
                 self.function_map[module] = data["functions"]
 
-        return self.linked_map
+            yield module, self.linked_map[module]
 
     def _is_local_module(self, module_name: str) -> bool:
         return module_name in self.module_data
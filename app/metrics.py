@@ -2,16 +2,23 @@
 
 import ast
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 from .config import should_ignore
+from .source_cache import read_source
+from .ast_metrics import UnifiedAstMetrics, collect_metrics
 
 class MetricsAnalyzer:
     """Analyzes basic code metrics like LOC, function counts, etc."""
     
-    def __init__(self, root_path: str, module_data: Dict[str, Dict]):
+    def __init__(self, root_path: str, module_data: Dict[str, Dict],
+                 ast_cache: Optional[Dict[str, ast.Module]] = None, source_cache: Optional[Dict[str, str]] = None,
+                 ast_metrics: Optional[Dict[str, UnifiedAstMetrics]] = None):
         self.root_path = root_path
         self.module_data = module_data
+        self.ast_cache = ast_cache
+        self.source_cache = source_cache
+        self.ast_metrics = ast_metrics
         
     def analyze_metrics(self) -> Dict[str, Any]:
         """Analyze code metrics for all modules"""
@@ -56,12 +63,8 @@ class MetricsAnalyzer:
             if not file_path or not os.path.exists(file_path):
                 return {}
                 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
-                
-            tree = ast.parse(source)
-            visitor = MetricsVisitor()
-            visitor.visit(tree)
+            source = read_source(file_path, self.source_cache)
+            visitor = collect_metrics(file_path, self.ast_cache, self.ast_metrics)
             
             lines_of_code = len([line for line in source.split('\n') if line.strip() and not line.strip().startswith('#')])
             total_lines = len(source.split('\n'))
@@ -155,37 +158,3 @@ class MetricsAnalyzer:
             insights.append("Code metrics look healthy - good balance of module sizes and documentation.")
             
         return insights
-
-
-class MetricsVisitor(ast.NodeVisitor):
-    """AST visitor to collect basic metrics"""
-    
-    def __init__(self):
-        self.function_count = 0
-        self.class_count = 0
-        self.nested_count = 0
-        self.depth = 0
-        
-    def visit_FunctionDef(self, node):
-        self.function_count += 1
-        if self.depth > 0:
-            self.nested_count += 1
-        self.depth += 1
-        self.generic_visit(node)
-        self.depth -= 1
-        
-    def visit_AsyncFunctionDef(self, node):
-        self.function_count += 1
-        if self.depth > 0:
-            self.nested_count += 1
-        self.depth += 1
-        self.generic_visit(node)
-        self.depth -= 1
-        
-    def visit_ClassDef(self, node):
-        self.class_count += 1
-        if self.depth > 0:
-            self.nested_count += 1
-        self.depth += 1
-        self.generic_visit(node)
-        self.depth -= 1
\ No newline at end of file
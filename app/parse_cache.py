@@ -0,0 +1,58 @@
+# parse_cache.py
+
+import ast
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Most recently used trees kept in memory; older ones are dropped first
+MAX_CACHED_TREES = 256
+
+# path -> (mtime_ns, size, content digest, tree)
+_trees: "OrderedDict[str, Tuple[int, int, bytes, ast.Module]]" = OrderedDict()
+_lock = threading.Lock()
+
+def content_digest(content: bytes) -> bytes:
+    """Fingerprint of a file's bytes: blake3 when installed, else 16-byte blake2b"""
+    if blake3 is not None:
+        return blake3(content).digest()
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+def get_tree(path: str) -> ast.Module:
+    """Parse a Python file, reusing the cached tree while the file's content is unchanged"""
+    st = os.stat(path)
+    with _lock:
+        entry = _trees.get(path)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            _trees.move_to_end(path)
+            return entry[3]
+
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = content_digest(content)
+    if entry is not None and entry[2] == digest:
+        # Touched but not changed: keep the tree, refresh the stat fast path
+        tree = entry[3]
+    else:
+        # Imported here: ast_cache builds on this module's content_digest
+        from .ast_cache import parse_cached
+        tree = parse_cached(content, filename=path, digest=digest)
+
+    with _lock:
+        _trees[path] = (st.st_mtime_ns, st.st_size, digest, tree)
+        _trees.move_to_end(path)
+        while len(_trees) > MAX_CACHED_TREES:
+            _trees.popitem(last=False)
+    return tree
+
+def clear():
+    """Drop every cached tree"""
+    with _lock:
+        _trees.clear()
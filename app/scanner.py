@@ -2,7 +2,7 @@
 
 import ast
 import os
-from typing import Dict, Set, List, Tuple
+from typing import Dict, Set, List, Tuple, Iterator
 from .config import should_ignore
 
 class FunctionVisitor(ast.NodeVisitor):
@@ -45,8 +45,11 @@ class ModuleScanner:
     def __init__(self, root_path: str):
         self.root_path = os.path.abspath(root_path)
         self.module_map: Dict[str, Dict] = {}
+        # Totals for the most recent scan, kept so callers don't have to recount
+        self.stats: Dict[str, int] = {"modules": 0, "functions": 0}
 
-    def scan(self) -> Dict[str, Dict]:
+    def iter_files(self) -> Iterator[str]:
+        """Yield the path of every Python file that scan() would parse"""
         for dirpath, _, filenames in os.walk(self.root_path):
             if should_ignore(dirpath):
                 continue
@@ -55,8 +58,19 @@ class ModuleScanner:
                     filepath = os.path.join(dirpath, filename)
                     if should_ignore(filepath):
                         continue
-                    module_name = self._module_name_from_path(filepath)
-                    self.module_map[module_name] = self._parse_file(filepath)
+                    yield filepath
+
+    def scan_iter(self) -> Iterator[Tuple[str, Dict]]:
+        """Yield (module_name, module_data) for each file as it is parsed"""
+        self.stats = {"modules": 0, "functions": 0}
+        for filepath in self.iter_files():
+            module_data = self._parse_file(filepath)
+            self.stats["modules"] += 1
+            self.stats["functions"] += len(module_data["functions"])
+            yield self._module_name_from_path(filepath), module_data
+
+    def scan(self) -> Dict[str, Dict]:
+        self.module_map.update(self.scan_iter())
         return self.module_map
 
     def _module_name_from_path(self, path: str) -> str:
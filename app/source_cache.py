@@ -0,0 +1,69 @@
+# source_cache.py
+
+import ast
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .parse_cache import get_tree
+from .ast_cache import parse_cached
+
+@functools.lru_cache(maxsize=None)
+def module_to_filepath(root_path: str, module_name: str) -> str:
+    """Convert module name back to file path"""
+    rel_path = module_name.replace('.', os.sep) + '.py'
+    return os.path.join(root_path, rel_path)
+
+# Concurrent reads; enough to hide disk latency without flooding the device
+MAX_READ_THREADS = 8
+
+def _read_text(file_path: str) -> Optional[str]:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def build_caches(root_path: str, module_names: Iterable[str]) -> Tuple[Dict[str, str], Dict[str, ast.Module]]:
+    """Read and parse every module once, returning (source_cache, ast_cache) keyed by file path"""
+    source_cache = {}
+    ast_cache = {}
+    file_paths = [module_to_filepath(root_path, module_name) for module_name in module_names]
+    if not file_paths:
+        return source_cache, ast_cache
+    
+    # Reads are I/O-bound and overlap well on threads; parsing is CPU-bound and stays here
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_THREADS, len(file_paths))) as pool:
+        sources = list(pool.map(_read_text, file_paths))
+    
+    for file_path, source in zip(file_paths, sources):
+        if source is None:
+            continue
+        source_cache[file_path] = source
+        try:
+            ast_cache[file_path] = parse_cached(source)
+        except SyntaxError:
+            # Left out so the analyzers report the error themselves
+            pass
+    return source_cache, ast_cache
+
+def prefetch_sources(file_paths: List[str]) -> Iterator[Optional[str]]:
+    """Yield each file's text (None if unreadable) in order, reading ahead on threads
+    so the caller's processing of one file overlaps the reads of the next"""
+    if not file_paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_THREADS, len(file_paths))) as pool:
+        yield from pool.map(_read_text, file_paths)
+
+def read_source(file_path: str, source_cache: Optional[Dict[str, str]] = None) -> str:
+    """Return the file's text, from source_cache when it has it"""
+    if source_cache is not None and file_path in source_cache:
+        return source_cache[file_path]
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def load_tree(file_path: str, ast_cache: Optional[Dict[str, ast.Module]] = None) -> ast.Module:
+    """Return the parsed module, from ast_cache or else the process-wide parse cache"""
+    if ast_cache is not None and file_path in ast_cache:
+        return ast_cache[file_path]
+    return get_tree(file_path)
@@ -1,7 +1,8 @@
 # summary.py
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Tuple, BinaryIO
 from datetime import datetime
+from .exporter import write_json_sections
 
 class ProjectSummarizer:
     """Creates LLM-friendly project summaries combining all analysis data"""
@@ -11,54 +12,68 @@ class ProjectSummarizer:
         
     def generate_summary(self) -> Dict[str, Any]:
         """Generate main project summary for LLM consumption"""
-        try:
-            # Extract key data from various analyses
-            deps = self.data.get('dependencies', {})
-            functions = self.data.get('functions', {})
-            metrics = self.data.get('metrics', {})
-            complexity = self.data.get('complexity', {})
-            db_calls = self.data.get('db_calls', {})
-            docs = self.data.get('documentation', {})
-            
-            return {
-                "project_description": self._generate_project_description(metrics, deps),
-                "architecture_overview": self._generate_architecture_overview(deps, functions, db_calls),
-                "code_health_summary": self._generate_health_summary(metrics, complexity, docs),
-                "dependency_insights": self._generate_dependency_insights(deps),
-                "complexity_highlights": self._generate_complexity_highlights(complexity),
-                "database_usage_summary": self._generate_database_summary(db_calls),
-                "documentation_status": self._generate_documentation_status(docs),
-                "key_recommendations": self._generate_key_recommendations(),
-                "suggested_questions": self._generate_suggested_questions()
-            }
-            
-        except Exception as e:
-            return {
-                "error": f"Summary generation failed: {str(e)}",
-                "explanation": "Unable to generate project summary, but individual analysis files are still available."
-            }
+        return dict(self.iter_summary())
+    
+    def iter_summary(self) -> Iterator[Tuple[str, Any]]:
+        """Yield the main project summary one (key, section) pair at a time; a section
+        that fails is yielded as its own error, so the sections before it stay valid"""
+        # Extract key data from various analyses
+        deps = self.data.get('dependencies', {})
+        functions = self.data.get('functions', {})
+        metrics = self.data.get('metrics', {})
+        complexity = self.data.get('complexity', {})
+        db_calls = self.data.get('db_calls', {})
+        docs = self.data.get('documentation', {})
+        
+        return self._guarded_sections((
+            ("project_description", lambda: self._generate_project_description(metrics, deps)),
+            ("architecture_overview", lambda: self._generate_architecture_overview(deps, functions, db_calls)),
+            ("code_health_summary", lambda: self._generate_health_summary(metrics, complexity, docs)),
+            ("dependency_insights", lambda: self._generate_dependency_insights(deps)),
+            ("complexity_highlights", lambda: self._generate_complexity_highlights(complexity)),
+            ("database_usage_summary", lambda: self._generate_database_summary(db_calls)),
+            ("documentation_status", lambda: self._generate_documentation_status(docs)),
+            ("key_recommendations", self._generate_key_recommendations),
+            ("suggested_questions", self._generate_suggested_questions),
+        ), "Summary generation failed", "Unable to generate this part of the project summary, but individual analysis files are still available.")
+    
+    def stream_summary(self, f: BinaryIO, pretty: bool = True):
+        """Write the main summary as JSON to a binary file without building it all in memory"""
+        write_json_sections(f, "project_summary", self.iter_summary(), pretty=pretty)
     
     def create_llm_context(self) -> Dict[str, Any]:
         """Create detailed technical context for LLM ingestion"""
-        try:
-            deps = self.data.get('dependencies', {})
-            functions = self.data.get('functions', {})
-            metrics = self.data.get('metrics', {})
-            complexity = self.data.get('complexity', {})
-            
-            return {
-                "codebase_summary": self._create_codebase_summary(metrics, deps),
-                "module_explanations": self._create_module_explanations(deps, functions, complexity),
-                "architectural_insights": self._create_architectural_insights(deps, functions),
-                "change_impact_guide": self._create_change_impact_guide(deps),
-                "technical_context": self._create_technical_context(functions, complexity)
-            }
-            
-        except Exception as e:
-            return {
-                "error": f"LLM context generation failed: {str(e)}",
-                "explanation": "Unable to generate LLM context, but other analysis files are available."
-            }
+        return dict(self.iter_llm_context())
+    
+    def iter_llm_context(self) -> Iterator[Tuple[str, Any]]:
+        """Yield the LLM context one (key, section) pair at a time; a section that
+        fails is yielded as its own error, so the sections before it stay valid"""
+        deps = self.data.get('dependencies', {})
+        functions = self.data.get('functions', {})
+        metrics = self.data.get('metrics', {})
+        complexity = self.data.get('complexity', {})
+        
+        return self._guarded_sections((
+            ("codebase_summary", lambda: self._create_codebase_summary(metrics, deps)),
+            ("module_explanations", lambda: self._create_module_explanations(deps, functions, complexity)),
+            ("architectural_insights", lambda: self._create_architectural_insights(deps, functions)),
+            ("change_impact_guide", lambda: self._create_change_impact_guide(deps)),
+            ("technical_context", lambda: self._create_technical_context(functions, complexity)),
+        ), "LLM context generation failed", "Unable to generate this part of the LLM context, but other analysis files are available.")
+    
+    def _guarded_sections(self, sections, failure: str, explanation: str) -> Iterator[Tuple[str, Any]]:
+        """Build and yield each (key, builder) section in turn, a failing one as
+        {"error": ..., "explanation": ...} under its own key"""
+        for key, build in sections:
+            try:
+                section = build()
+            except Exception as e:
+                section = {"error": f"{failure}: {str(e)}", "explanation": explanation}
+            yield key, section
+    
+    def stream_llm_context(self, f: BinaryIO, pretty: bool = True):
+        """Write the LLM context as JSON to a binary file without building it all in memory"""
+        write_json_sections(f, "llm_context", self.iter_llm_context(), pretty=pretty)
     
     def _generate_project_description(self, metrics: Dict, deps: Dict) -> str:
         """Generate human-readable project description"""
@@ -55,6 +55,8 @@ def install_dependencies():
         "graphviz",
         "networkx"
     ]
+    if sys.version_info < (3, 11):
+        deps.append("tomli")
     
     for dep in deps:
         if not run_command(f"{sys.executable} -m pip install {dep}", 